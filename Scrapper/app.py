@@ -1,5 +1,5 @@
-from fastapi import FastAPI, HTTPException, BackgroundTasks, APIRouter, Request
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi import FastAPI, HTTPException, APIRouter, Request
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, ValidationError
 from typing import Optional, Dict, Any, List
@@ -9,9 +9,17 @@ import pandas as pd
 import base64
 import asyncio
 import time
+import threading
 import traceback
 from datetime import datetime
 from scraper import CraigslistScraper
+from store import ListingStore
+from status import scraping_status
+from jobs import run_scrape, mark_failed, JobScheduler
+from schedules import RecurringScheduler
+from progress import ProgressTracker, EventBroker
+from selector_resolver import resolver
+from browser import standby, get_driver_path
 import subprocess
 import sys
 import logging
@@ -37,18 +45,9 @@ app.add_middleware(
     max_age=3600,  # Cache preflight requests for 1 hour
 )
 
-# Global variables
+# Global variables; scraping_status is shared with the scraper thread through status.py
 scraper = None
-scraping_status = {
-    "is_running": False,
-    "progress": 0,
-    "current_phase": "Not Started",
-    "last_completed": None,
-    "completed": False,
-    "error": False,
-    "no_results": False,
-    "current_city": None
-}
+scraper_thread = None
 
 # Current configuration (modified via API)
 current_config = {
@@ -58,8 +57,18 @@ current_config = {
     "remote_keywords": REMOTE_KEYWORDS,
     "non_remote_keywords": NON_REMOTE_KEYWORDS,
     "use_headless": os.getenv('USE_HEADLESS', 'false').lower() == 'true',
+    "lean_browser": os.getenv('LEAN_BROWSER', 'true').lower() == 'true',
     "batch_size": int(os.getenv('BATCH_SIZE', 10)),
-    "max_retries": int(os.getenv('MAX_RETRIES', 3))
+    "max_retries": int(os.getenv('MAX_RETRIES', 3)),
+    "workers": int(os.getenv('WORKERS', 1)),
+    "tabs": int(os.getenv('TABS_PER_WORKER', 1)),
+    "skip_seen": os.getenv('SKIP_SEEN', 'true').lower() == 'true',
+    "max_pages": int(os.getenv('MAX_SEARCH_PAGES', 10)),
+    "incremental": os.getenv('INCREMENTAL', 'false').lower() == 'true',
+    "search_query": os.getenv('SEARCH_QUERY', 'false').lower() == 'true',
+    "near_dup_threshold": float(os.getenv('NEAR_DUP_THRESHOLD', 0.8)),
+    "captcha_mode": os.getenv('CAPTCHA_MODE', 'quarantine').lower(),
+    "engine": os.getenv('SCRAPE_ENGINE', 'http').lower()
 }
 
 class ConfigUpdate(BaseModel):
@@ -69,8 +78,35 @@ class ConfigUpdate(BaseModel):
     remote_keywords: Optional[List[str]] = None
     non_remote_keywords: Optional[List[str]] = None
     use_headless: Optional[bool] = None
+    lean_browser: Optional[bool] = None
     batch_size: Optional[int] = None
     max_retries: Optional[int] = None
+    workers: Optional[int] = None
+    tabs: Optional[int] = None
+    skip_seen: Optional[bool] = None
+    max_pages: Optional[int] = None
+    incremental: Optional[bool] = None
+    search_query: Optional[bool] = None
+    near_dup_threshold: Optional[float] = None
+    captcha_mode: Optional[str] = None
+    engine: Optional[str] = None
+
+class JobRequest(BaseModel):
+    cities: Optional[List[str]] = None
+    keywords: Optional[List[str]] = None
+    remote_keywords: Optional[List[str]] = None
+    non_remote_keywords: Optional[List[str]] = None
+    priority: int = 0
+    max_pages: Optional[int] = None
+    incremental: Optional[bool] = None
+    search_query: Optional[bool] = None
+    workers: Optional[int] = None
+    tabs: Optional[int] = None
+
+class ScheduleRequest(JobRequest):
+    cron: str
+    name: Optional[str] = None
+    enabled: bool = True
 
 def update_config_file(config: Dict[str, Any]):
     """Update the config.py file with new configuration values."""
@@ -86,17 +122,8 @@ NON_REMOTE_KEYWORDS = {json.dumps(config['non_remote_keywords'], indent=4)}
 
 def reset_status():
     """Reset the scraping status to default values."""
-    global scraping_status
-    scraping_status = {
-        "is_running": False,
-        "progress": 0,
-        "current_phase": "Not Started",
-        "last_completed": None,
-        "completed": False,
-        "error": False,
-        "no_results": False,
-        "current_city": None
-    }
+    # Reset in place so the scraper keeps writing to the same status object
+    scraping_status.reset()
 
 # Configure logging
 log_dir = "logs"
@@ -114,6 +141,36 @@ scraping_logger.addHandler(file_handler)
 # Keep original stdout for server messages
 original_stdout = sys.stdout
 
+# Progress events of every run, streamed to clients at /api/events
+event_broker = EventBroker()
+
+# Queued scrape jobs, run a few at a time on top of the current configuration
+job_scheduler = JobScheduler(current_config, logger=scraping_logger, progress_callbacks=[event_broker])
+
+# Recurring incremental scrapes, persisted in the listing store
+recurring_scheduler = RecurringScheduler(job_scheduler, ListingStore())
+
+# Keep a Chrome launched in the background so scrapes start without a cold start
+prewarm_driver = os.getenv('PREWARM_DRIVER', 'false').lower() == 'true'
+
+@app.on_event("startup")
+async def warm_up_driver():
+    """Resolve the ChromeDriver path and launch the standby browser if enabled."""
+    if prewarm_driver:
+        standby.warm(current_config["use_headless"], current_config["lean_browser"])
+    else:
+        # Still resolve the driver path ahead of the first scrape
+        threading.Thread(target=get_driver_path, daemon=True).start()
+    
+    # Start submitting the scheduled scrapes
+    recurring_scheduler.start()
+
+@app.on_event("shutdown")
+async def close_standby_driver():
+    """Stop the schedules and quit the standby browser when the server stops."""
+    recurring_scheduler.stop()
+    standby.close()
+
 @router.get("/")
 async def root():
     """Root endpoint with API information."""
@@ -123,13 +180,27 @@ async def root():
         "status": "running",
         "endpoints": {
             "GET /api": "This information",
-            "POST /api/start-scraping": "Start the scraping process",
+            "POST /api/start-scraping": "Start the scraping process (?resume=true continues the last run)",
             "GET /api/scraping-status": "Get current scraping status",
+            "GET /api/events": "Stream live progress events (Server-Sent Events), optionally for one job_id",
+            "GET /api/selector-stats": "Get which page layout variants matched, with hit/miss counts",
             "GET /api/download-results": "Download or save results to frontend public folder",
             "POST /api/update-config": "Update scraper configuration",
             "GET /api/current-config": "Get current configuration",
-            "POST /api/cleanup": "Clean up resources and stop scraping",
+            "POST /api/cleanup": "Clean up resources and output files once no scrape is running",
             "GET /api/view-logs": "View the most recent scraping log entries",
+            "POST /api/jobs": "Queue a scrape job with its own cities/keywords and a priority",
+            "GET /api/jobs": "List scrape jobs and their status",
+            "GET /api/jobs/{job_id}": "Get the status of a scrape job",
+            "GET /api/jobs/{job_id}/results": "Download the results of a scrape job",
+            "DELETE /api/jobs/{job_id}": "Cancel a queued scrape job",
+            "POST /api/schedules": "Create a recurring incremental scrape from a cron expression",
+            "GET /api/schedules": "List recurring scrapes",
+            "GET /api/schedules/{schedule_id}": "Get a recurring scrape",
+            "POST /api/schedules/{schedule_id}/pause": "Pause a recurring scrape",
+            "POST /api/schedules/{schedule_id}/resume": "Resume a recurring scrape",
+            "DELETE /api/schedules/{schedule_id}": "Delete a recurring scrape",
+            "GET /api/export/{name}": "Export the listing store's links, results, history or dead letters as CSV",
             "GET /api/files": "List all files in the frontend public folder",
             "DELETE /api/files/{filename}": "Delete a file from the frontend public folder",
             "DELETE /api/clean-frontend-files": "Delete all files from the frontend public output directory"
@@ -138,32 +209,26 @@ async def root():
     return response
 
 @router.post("/start-scraping")
-async def start_scraping(background_tasks: BackgroundTasks):
-    """Start the scraping process in the background."""
-    global scraper, scraping_status
+async def start_scraping(resume: bool = False):
+    """Start the scraping process in a worker thread, optionally resuming the last run."""
+    global scraper, scraper_thread
+    
+    # The previous run's thread still owns the shared status until it exits
+    if scraper_thread and scraper_thread.is_alive():
+        raise HTTPException(status_code=400, detail="Scraping is already running")
     
-    if scraping_status["is_running"]:
+    # Claim the run atomically so two requests can't both start one
+    if not scraping_status.try_start():
         raise HTTPException(status_code=400, detail="Scraping is already running")
     
     try:
-        # Clean up any stray ChromeDriver processes
-        try:
-            import psutil
-            
-            for proc in psutil.process_iter(['pid', 'name']):
-                try:
-                    if 'chromedriver' in proc.info['name'].lower():
-                        subprocess.run(['taskkill', '/F', '/PID', str(proc.info['pid'])], 
-                                       stdout=subprocess.DEVNULL, 
-                                       stderr=subprocess.DEVNULL)
-                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                    pass
-        except:
-            pass
+        # Browsers of the previous run were quit when it finished; any other
+        # ChromeDriver may belong to a scrape job or the standby, so none is killed here
         
         # Reset status if not in no_results state
         if not scraping_status["no_results"]:
             reset_status()
+            scraping_status["is_running"] = True
         
         # Open a new terminal to display scraping logs on Windows
         try:
@@ -178,20 +243,20 @@ async def start_scraping(background_tasks: BackgroundTasks):
         except Exception as e:
             print(f"Warning: Could not open separate terminal for logs: {str(e)}")
         
-        # Create a new scraper instance
-        scraper = CraigslistScraper()
-        
-        # Handle existing result file
+        # Handle existing result file; a resumed run continues from it
         output_file = os.getenv('OUTPUT_FILE', 'output/results.csv')
-        if os.path.exists(output_file):
+        if os.path.exists(output_file) and not resume:
             os.remove(output_file)
         
         scraping_status["is_running"] = True
         
         # Log scraping start
-        scraping_logger.info("Scraping process started")
+        scraping_logger.info("Scraping process resumed" if resume else "Scraping process started")
         
-        background_tasks.add_task(run_scraper)
+        # Selenium and the waits between requests block, so the scrape runs in its own
+        # thread and the event loop stays free to answer status and log requests
+        scraper_thread = threading.Thread(target=run_scraper, args=(resume,), name="scraper", daemon=True)
+        scraper_thread.start()
         return {"message": "Scraping started successfully", "status": "running"}
     except Exception as e:
         scraping_status["is_running"] = False
@@ -199,121 +264,79 @@ async def start_scraping(background_tasks: BackgroundTasks):
         scraping_logger.error(f"Error starting scraping: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
-async def run_scraper():
-    """Run the scraper process."""
-    global scraper, scraping_status
+def run_scraper(resume=False):
+    """Run the scraper process; called in the scraper thread."""
+    global scraper
+    progress = ProgressTracker([event_broker])
     
+    # The global only points to this run's scraper while it runs; this thread
+    # always closes its own scraper, never one a later run put in the global
+    run = None
     try:
-        # Phase 1: Scrape listings
-        scraping_status.update({
-            "is_running": True,
-            "progress": 0,
-            "current_phase": "Phase 1: Scraping listings",
-            "last_completed": "Starting Phase 1",
-            "completed": False,
-            "error": False,
-            "no_results": False
-        })
-        
-        # Redirect logging
-        scraping_logger.info("Phase 1: Starting to scrape listings")
-        
-        # Verify the driver is responsive
-        try:
-            current_url = scraper.driver.current_url
-            scraping_logger.info(f"Driver initialized, current URL: {current_url}")
-        except Exception as e:
-            error_msg = f"Error with ChromeDriver: {str(e)}"
-            scraping_logger.error(error_msg)
-            scraping_status.update({
-                "is_running": False,
-                "current_phase": "Error",
-                "last_completed": error_msg,
-                "error": True,
-                "completed": False
-            })
-            return
-        
-        # Scrape listings
-        scraping_logger.info("Scraping listings from configured cities...")
-        df = scraper.scrape_listings()
-        
-        if df is None or df.empty:
-            scraping_logger.info("No listings found - scraping complete")
-            scraping_status.update({
-                "is_running": False,
-                "progress": 0,
-                "current_phase": "Completed",
-                "last_completed": "No listings found",
-                "completed": True,
-                "error": False,
-                "no_results": True
-            })
-            return
-        
-        scraping_logger.info(f"Found {len(df)} listings")
-            
-        # Phase 2 - Step 1: Clean listings
-        scraping_status.update({
-            "is_running": True,
-            "progress": 30,
-            "current_phase": "Phase 2: Cleaning listings",
-            "last_completed": f"Found {len(df)} listings",
-        })
-        
-        scraping_logger.info("Phase 2: Cleaning listings and removing duplicates")
-        df = scraper.clean_listings(df)
-        scraping_logger.info(f"After cleaning: {len(df)} unique listings remain")
-        
-        # Phase 2 - Step 2: Scrape details
-        scraping_status.update({
-            "is_running": True,
-            "progress": 50,
-            "current_phase": "Phase 2: Scraping details",
-            "last_completed": f"Processing {len(df)} listings",
-        })
-        
-        scraping_logger.info(f"Phase 2: Scraping details for {len(df)} listings")
-        results_df = scraper.scrape_details(df)
-        
-        # Update final status
-        scraping_logger.info(f"Scraping complete! Total results: {len(results_df)} listings")
-        scraping_status.update({
-            "is_running": False,
-            "progress": 100,
-            "current_phase": "Completed",
-            "last_completed": "Scraping Complete",
-            "completed": True,
-            "error": False,
-            "no_results": False
-        })
+        # Create a new scraper instance; starting a browser blocks, so it happens in this thread
+        run = scraper = CraigslistScraper(settings=current_config, rate=job_scheduler.rate, progress=progress)
+        
+        run_scrape(run, scraping_status, scraping_logger, resume=resume)
         
     except Exception as e:
-        error_msg = f"Error during scraping: {str(e)}"
-        scraping_logger.error(error_msg)
-        scraping_logger.error(traceback.format_exc())
-        scraping_status.update({
-            "is_running": False,
-            "current_phase": "Error",
-            "last_completed": f"Error: {str(e)}",
-            "error": True,
-            "completed": False
-        })
+        mark_failed(scraping_status, scraping_logger, e, progress)
         
     finally:
         # Ensure browser is closed
-        if scraper:
+        if run:
             try:
-                scraper.close()
+                run.close()
                 scraping_logger.info("Browser closed successfully")
             except Exception as e:
                 scraping_logger.error(f"Error closing browser: {str(e)}")
-            scraper = None
+            if scraper is run:
+                scraper = None
+        
+        # Have a fresh standby browser ready for the next run
+        if prewarm_driver:
+            standby.warm(current_config["use_headless"], current_config["lean_browser"])
 
 @router.get("/scraping-status")
 async def get_scraping_status():
     """Get the current status of the scraping process."""
-    return scraping_status
+    return scraping_status.snapshot()
+
+@router.get("/events")
+async def stream_events(request: Request, job_id: Optional[str] = None):
+    """
+    Stream progress events as Server-Sent Events.
+    
+    Events report listings found per city, details done, listings per minute,
+    ETA, blocks, retries and errors. job_id limits the stream to one job.
+    """
+    queue = event_broker.subscribe(asyncio.get_running_loop())
+    
+    async def event_stream():
+        try:
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    # Keep proxies from closing an idle connection
+                    yield ": keep-alive\n\n"
+                    continue
+                
+                if job_id and event.get("job_id") != job_id:
+                    continue
+                yield f"event: {event['event']}\ndata: {json.dumps(event, default=str)}\n\n"
+        finally:
+            event_broker.unsubscribe(queue)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/selector-stats")
+async def get_selector_stats():
+    """Get the learned selector variants and their hit/miss counts per page element."""
+    return resolver.stats()
 
 @router.get("/download-results")
 async def download_results(save_to_frontend: bool = True):
@@ -474,10 +497,30 @@ async def update_config(config_update: ConfigUpdate):
             raise HTTPException(status_code=422, detail="Keywords must be a list")
         if 'use_headless' in update_dict and not isinstance(update_dict['use_headless'], bool):
             raise HTTPException(status_code=422, detail="use_headless must be a boolean")
+        if 'lean_browser' in update_dict and not isinstance(update_dict['lean_browser'], bool):
+            raise HTTPException(status_code=422, detail="lean_browser must be a boolean")
         if 'batch_size' in update_dict and not isinstance(update_dict['batch_size'], int):
             raise HTTPException(status_code=422, detail="batch_size must be an integer")
         if 'max_retries' in update_dict and not isinstance(update_dict['max_retries'], int):
             raise HTTPException(status_code=422, detail="max_retries must be an integer")
+        if 'workers' in update_dict and (not isinstance(update_dict['workers'], int) or update_dict['workers'] < 1):
+            raise HTTPException(status_code=422, detail="workers must be a positive integer")
+        if 'tabs' in update_dict and (not isinstance(update_dict['tabs'], int) or update_dict['tabs'] < 1):
+            raise HTTPException(status_code=422, detail="tabs must be a positive integer")
+        if 'skip_seen' in update_dict and not isinstance(update_dict['skip_seen'], bool):
+            raise HTTPException(status_code=422, detail="skip_seen must be a boolean")
+        if 'max_pages' in update_dict and (not isinstance(update_dict['max_pages'], int) or update_dict['max_pages'] < 1):
+            raise HTTPException(status_code=422, detail="max_pages must be a positive integer")
+        if 'incremental' in update_dict and not isinstance(update_dict['incremental'], bool):
+            raise HTTPException(status_code=422, detail="incremental must be a boolean")
+        if 'search_query' in update_dict and not isinstance(update_dict['search_query'], bool):
+            raise HTTPException(status_code=422, detail="search_query must be a boolean")
+        if 'near_dup_threshold' in update_dict and not 0 <= update_dict['near_dup_threshold'] <= 1:
+            raise HTTPException(status_code=422, detail="near_dup_threshold must be between 0 and 1")
+        if 'captcha_mode' in update_dict and update_dict['captcha_mode'] not in ('quarantine', 'wait'):
+            raise HTTPException(status_code=422, detail="captcha_mode must be 'quarantine' or 'wait'")
+        if 'engine' in update_dict and update_dict['engine'] not in ('http', 'browser'):
+            raise HTTPException(status_code=422, detail="engine must be 'http' or 'browser'")
         
         # Update the current config
         current_config.update(update_dict)
@@ -513,25 +556,41 @@ async def get_current_config():
 
 @router.post("/cleanup")
 async def cleanup():
-    """Clean up resources and stop any running scraping process."""
-    global scraping_status, scraper
+    """Clean up the resources and output files of finished scrapes."""
+    global scraper
+    
+    # The scraper thread can't be stopped from outside; closing its browsers and
+    # store under it would let its final status overwrite the next run's
+    if scraper_thread and scraper_thread.is_alive():
+        raise HTTPException(status_code=409, detail="Scraping is still running, wait for it to finish")
+    
+    # Cleanup deletes the output files, which running jobs are still writing to
+    active_jobs = [job.id for job in job_scheduler.list_jobs() if job.state in ("queued", "running")]
+    if active_jobs:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Scrape jobs are still active, cancel them first: {', '.join(active_jobs)}"
+        )
     
     try:
+        standby.close()
+        
         # Close the scraper if it's running
         if scraper:
+            # Only this scraper's browsers are killed; other ChromeDriver processes may belong to jobs
+            driver_pids = scraper.driver_pids()
             try:
                 scraper.close()
                 scraper = None
             except:
                 pass
             
-            # Kill any remaining ChromeDriver processes
+            # Kill its ChromeDriver processes that didn't quit
             try:
                 import psutil
-                import subprocess
-                for proc in psutil.process_iter(['pid', 'name']):
-                    if 'chromedriver' in proc.info['name'].lower():
-                        subprocess.run(['taskkill', '/F', '/PID', str(proc.info['pid'])], 
+                for pid in driver_pids:
+                    if psutil.pid_exists(pid):
+                        subprocess.run(['taskkill', '/F', '/PID', str(pid)], 
                                     stdout=subprocess.DEVNULL, 
                                     stderr=subprocess.DEVNULL)
             except:
@@ -555,6 +614,131 @@ async def cleanup():
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def validate_job_config(config: Dict[str, Any]):
+    """Reject job settings the scraper can't run with."""
+    for key in ('cities', 'keywords'):
+        if key in config and not config[key]:
+            raise HTTPException(status_code=422, detail=f"{key} must not be empty")
+    for key in ('max_pages', 'workers', 'tabs'):
+        if key in config and config[key] < 1:
+            raise HTTPException(status_code=422, detail=f"{key} must be a positive integer")
+
+@router.post("/jobs")
+async def create_job(job_request: JobRequest):
+    """Queue a scrape job; higher priorities start first."""
+    config = job_request.dict(exclude_unset=True, exclude={"priority"})
+    validate_job_config(config)
+    
+    job = job_scheduler.submit(config, priority=job_request.priority)
+    return {"job_id": job.id, "state": job.state, "priority": job.priority}
+
+@router.get("/jobs")
+async def list_jobs():
+    """List all scrape jobs, newest first."""
+    return [job.to_dict() for job in job_scheduler.list_jobs()]
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Get a scrape job with its status."""
+    job = job_scheduler.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job.to_dict()
+
+@router.get("/jobs/{job_id}/results")
+async def download_job_results(job_id: str):
+    """Download the results CSV of a scrape job."""
+    job = job_scheduler.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    
+    results_file = os.path.join(job.output_dir, "results.csv")
+    if not os.path.exists(results_file):
+        raise HTTPException(status_code=404, detail=f"Job {job_id} has no results yet")
+    return FileResponse(results_file, media_type="text/csv", filename=f"results_{job_id}.csv")
+
+@router.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    """Cancel a scrape job that hasn't started yet."""
+    job = job_scheduler.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    if not job_scheduler.cancel(job_id):
+        raise HTTPException(status_code=400, detail=f"Job {job_id} is {job.state} and can't be cancelled")
+    return {"job_id": job_id, "state": "cancelled"}
+
+@router.post("/schedules")
+async def create_schedule(schedule_request: ScheduleRequest):
+    """Create a recurring scrape; runs are incremental unless incremental is set to false."""
+    config = schedule_request.dict(exclude_unset=True, exclude={"priority", "cron", "name", "enabled"})
+    validate_job_config(config)
+    
+    try:
+        return recurring_scheduler.add(
+            schedule_request.cron,
+            config,
+            priority=schedule_request.priority,
+            name=schedule_request.name,
+            enabled=schedule_request.enabled
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+@router.get("/schedules")
+async def list_schedules():
+    """List all recurring scrapes."""
+    return recurring_scheduler.list_schedules()
+
+@router.get("/schedules/{schedule_id}")
+async def get_schedule(schedule_id: str):
+    """Get a recurring scrape."""
+    schedule = recurring_scheduler.get(schedule_id)
+    if schedule is None:
+        raise HTTPException(status_code=404, detail=f"Schedule {schedule_id} not found")
+    return schedule
+
+@router.post("/schedules/{schedule_id}/pause")
+async def pause_schedule(schedule_id: str):
+    """Stop a recurring scrape from starting new runs."""
+    schedule = recurring_scheduler.set_enabled(schedule_id, False)
+    if schedule is None:
+        raise HTTPException(status_code=404, detail=f"Schedule {schedule_id} not found")
+    return schedule
+
+@router.post("/schedules/{schedule_id}/resume")
+async def resume_schedule(schedule_id: str):
+    """Let a paused recurring scrape run again from its next due time."""
+    schedule = recurring_scheduler.set_enabled(schedule_id, True)
+    if schedule is None:
+        raise HTTPException(status_code=404, detail=f"Schedule {schedule_id} not found")
+    return schedule
+
+@router.delete("/schedules/{schedule_id}")
+async def delete_schedule(schedule_id: str):
+    """Delete a recurring scrape; jobs it already started keep running."""
+    if not recurring_scheduler.remove(schedule_id):
+        raise HTTPException(status_code=404, detail=f"Schedule {schedule_id} not found")
+    return {"schedule_id": schedule_id, "deleted": True}
+
+@router.get("/export/{name}")
+async def export_csv(name: str):
+    """Export all links, results, history or dead letters from the listing store as a CSV file."""
+    views = {"links": "links_csv", "results": "results_csv", "history": "history_csv", "dead_letters": "dead_letters_csv"}
+    if name not in views:
+        raise HTTPException(status_code=404, detail=f"Unknown export {name}, expected one of {list(views)}")
+    
+    try:
+        store = ListingStore()
+        try:
+            export_file = os.path.join("output", f"export_{name}.csv")
+            store.export_csv(views[name], export_file)
+        finally:
+            store.close()
+        
+        return FileResponse(export_file, media_type="text/csv", filename=f"{name}.csv")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error exporting {name}: {str(e)}")
+
 @router.get("/view-logs")
 async def view_logs(lines: int = 50):
     """View the most recent scraping log entries."""
@@ -0,0 +1,39 @@
+import threading
+from collections import Counter
+
+class BlockMonitor:
+    """
+    Thread-safe counters of block and CAPTCHA events.
+
+    Events are counted per city and per identity (the worker browser or HTTP
+    session that was blocked), so it is visible which region or which
+    identity is drawing the blocks.
+    """
+
+    def __init__(self):
+        self.by_city = Counter()
+        self.by_identity = Counter()
+        self.by_kind = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, city, identity, kind="block"):
+        """Count one block event of the given kind ("block" or "captcha")."""
+        with self._lock:
+            self.by_city[city or "unknown"] += 1
+            self.by_identity[identity or "unknown"] += 1
+            self.by_kind[kind] += 1
+
+    def total(self):
+        """Return the number of block events recorded."""
+        with self._lock:
+            return sum(self.by_kind.values())
+
+    def stats(self):
+        """Return the block counts per city, per identity and per kind."""
+        with self._lock:
+            return {
+                "total": sum(self.by_kind.values()),
+                "by_kind": dict(self.by_kind),
+                "by_city": dict(self.by_city.most_common()),
+                "by_identity": dict(self.by_identity.most_common())
+            }
@@ -0,0 +1,203 @@
+import os
+import threading
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import SessionNotCreatedException
+from webdriver_manager.chrome import ChromeDriverManager
+from utils import get_random_user_agent
+
+# ChromeDriver path resolved once per process, and remembered across processes in a cache file
+_driver_path = None
+_driver_path_lock = threading.Lock()
+DRIVER_PATH_CACHE = os.getenv('DRIVER_PATH_CACHE', '.chromedriver_path')
+
+# Resources the scraper never reads, blocked in lean mode
+BLOCKED_RESOURCE_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.css",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.mp3", "*.ogg"
+]
+
+def get_driver_path(refresh=False):
+    """
+    Return the ChromeDriver binary path, resolving it through webdriver_manager only once.
+
+    refresh=True drops the cached path and resolves it again, e.g. after
+    Chrome auto-updated and the cached driver no longer matches it.
+    """
+    global _driver_path
+
+    with _driver_path_lock:
+        # An explicitly configured driver skips resolution entirely
+        configured = os.getenv('CHROMEDRIVER_PATH')
+        if configured and os.path.exists(configured):
+            _driver_path = configured
+            return _driver_path
+
+        if refresh:
+            _driver_path = None
+            try:
+                if os.path.exists(DRIVER_PATH_CACHE):
+                    os.remove(DRIVER_PATH_CACHE)
+            except Exception as e:
+                print(f"Warning: Could not clear driver path cache: {str(e)}")
+
+        if _driver_path and os.path.exists(_driver_path):
+            return _driver_path
+
+        try:
+            if os.path.exists(DRIVER_PATH_CACHE):
+                with open(DRIVER_PATH_CACHE, 'r', encoding='utf-8') as f:
+                    cached = f.read().strip()
+                if cached and os.path.exists(cached):
+                    _driver_path = cached
+                    return _driver_path
+        except Exception as e:
+            print(f"Warning: Could not read driver path cache: {str(e)}")
+
+        _driver_path = ChromeDriverManager().install()
+
+        try:
+            with open(DRIVER_PATH_CACHE, 'w', encoding='utf-8') as f:
+                f.write(_driver_path)
+        except Exception as e:
+            print(f"Warning: Could not write driver path cache: {str(e)}")
+
+        return _driver_path
+
+def build_chrome_options(headless=False, lean=False):
+    """
+    Return the Chrome options used by the scraper.
+    
+    Lean mode disables images and returns from page loads at DOMContentLoaded
+    (pageLoadStrategy=eager) instead of waiting for every subresource. CSS,
+    fonts and media are blocked per tab by apply_resource_blocking.
+    """
+    chrome_options = Options()
+    if headless:
+        chrome_options.add_argument("--headless=new")
+
+    # Add Chrome options for stability
+    chrome_options.add_argument("--window-size=1920,1080")
+    chrome_options.add_argument("--disable-notifications")
+    chrome_options.add_argument("--disable-extensions")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument(f"user-agent={get_random_user_agent()}")
+    
+    if lean:
+        chrome_options.page_load_strategy = 'eager'
+        chrome_options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2
+        })
+    return chrome_options
+
+def apply_resource_blocking(driver):
+    """Block images, CSS, fonts and media in the current tab through CDP."""
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_RESOURCE_PATTERNS})
+    except Exception as e:
+        print(f"Warning: Could not enable resource blocking: {str(e)}")
+
+def create_driver(headless=False, lean=False):
+    """Launch a new Chrome WebDriver instance."""
+    try:
+        driver = webdriver.Chrome(service=Service(get_driver_path()), options=build_chrome_options(headless, lean))
+    except SessionNotCreatedException as e:
+        configured = os.getenv('CHROMEDRIVER_PATH')
+        if configured and os.path.exists(configured):
+            raise
+        # Usually a cached driver that no longer matches an auto-updated Chrome
+        print(f"Chrome session could not be created, resolving ChromeDriver again: {str(e).splitlines()[0]}")
+        driver = webdriver.Chrome(service=Service(get_driver_path(refresh=True)), options=build_chrome_options(headless, lean))
+    driver.set_page_load_timeout(30)
+    
+    if lean:
+        apply_resource_blocking(driver)
+    return driver
+
+class DriverStandby:
+    """
+    Keeps one pre-launched Chrome ready so a scrape doesn't wait for a cold start.
+
+    warm() launches the standby in a background thread; take() hands it out
+    if it was launched with the requested headless and lean modes.
+    """
+
+    def __init__(self):
+        self._driver = None
+        self._mode = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def warm(self, headless=False, lean=False):
+        """Start launching a standby driver in the background if none is ready."""
+        with self._lock:
+            if self._driver is not None or (self._thread and self._thread.is_alive()):
+                return
+
+            self._thread = threading.Thread(target=self._launch, args=(headless, lean), daemon=True)
+            self._thread.start()
+
+    def _launch(self, headless, lean):
+        try:
+            driver = create_driver(headless, lean)
+        except Exception as e:
+            print(f"Warning: Could not pre-warm Chrome: {str(e)}")
+            return
+
+        with self._lock:
+            self._driver = driver
+            self._mode = (headless, lean)
+        print("Standby Chrome driver is ready")
+
+    def take(self, headless=False, lean=False, wait=True):
+        """Return the standby driver if it matches the requested modes, otherwise None."""
+        thread = self._thread
+        if wait and thread and thread.is_alive():
+            # A launch in progress is still faster than starting from scratch
+            thread.join()
+
+        with self._lock:
+            if self._driver is None or self._mode != (headless, lean):
+                return None
+            driver, self._driver = self._driver, None
+
+        # Make sure the standby survived while it was waiting
+        try:
+            driver.current_url
+            return driver
+        except Exception:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+            return None
+
+    def pids(self):
+        """Return the ChromeDriver process IDs owned by the standby."""
+        with self._lock:
+            if self._driver is None:
+                return set()
+            try:
+                return {self._driver.service.process.pid}
+            except Exception:
+                return set()
+
+    def close(self):
+        """Quit the standby driver."""
+        with self._lock:
+            driver, self._driver = self._driver, None
+
+        if driver:
+            try:
+                driver.quit()
+            except Exception as e:
+                print(f"Error closing standby browser: {str(e)}")
+
+# Process-wide standby shared by the API and the scraper
+standby = DriverStandby()
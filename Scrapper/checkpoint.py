@@ -0,0 +1,55 @@
+import os
+import csv
+import threading
+
+class CheckpointWriter:
+    """
+    Append-only CSV writer that flushes every record as soon as it is written.
+
+    Each record costs one appended line, so checkpointing stays constant-time
+    per listing. The file is fsynced every fsync_interval records and on close.
+    """
+
+    def __init__(self, filepath, columns, fsync_interval=10, append=False):
+        self.filepath = filepath
+        self.columns = list(columns)
+        self.fsync_interval = max(1, int(fsync_interval))
+        self._unsynced = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(filepath)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        write_header = not append or not os.path.exists(filepath) or os.path.getsize(filepath) == 0
+        self._file = open(filepath, 'a' if append else 'w', encoding='utf-8', newline='')
+        self._writer = csv.DictWriter(self._file, fieldnames=self.columns, extrasaction='ignore')
+
+        if write_header:
+            self._writer.writeheader()
+            self._sync()
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+
+    def write(self, record):
+        """Append a single record to the checkpoint file."""
+        with self._lock:
+            self._writer.writerow(record)
+            self._file.flush()
+            self._unsynced += 1
+
+            if self._unsynced >= self.fsync_interval:
+                self._sync()
+
+    def close(self):
+        """Sync and close the checkpoint file."""
+        with self._lock:
+            if self._file.closed:
+                return
+            try:
+                self._sync()
+            finally:
+                self._file.close()
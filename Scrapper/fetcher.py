@@ -0,0 +1,68 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from utils import get_random_user_agent
+
+# Status codes Craigslist answers blocked or throttled HTTP clients with
+BLOCK_STATUS_CODES = {403, 429}
+
+class HttpFetcher:
+    """Pooled HTTP client for static Craigslist pages that don't need a browser."""
+
+    def __init__(self, max_retries=3, timeout=30, pool_size=10):
+        self.timeout = timeout
+        self.session = requests.Session()
+
+        # Retry transient server errors with backoff. Throttling (429) is not retried
+        # here: it goes straight to the caller, whose rate limiter backs off the host
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=1,
+            status_forcelist=[500, 502, 503, 504],
+            allowed_methods=["GET"],
+            # urllib3 would otherwise still retry a 429 that carries a Retry-After header
+            respect_retry_after_header=False,
+            # Return the last response when retries run out instead of raising
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self.session.headers.update({
+            "User-Agent": get_random_user_agent(),
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            "Accept-Language": "en-US,en;q=0.9"
+        })
+
+    def fetch(self, url, params=None):
+        """
+        Fetch a page and return (status_code, html).
+
+        html is None for any error response; status_code is None when no
+        response arrived at all, e.g. on a connection error.
+        """
+        if not url or not isinstance(url, str):
+            return None, None
+
+        try:
+            response = self.session.get(url, params=params, timeout=self.timeout)
+            response.raise_for_status()
+            return response.status_code, response.text
+        except requests.HTTPError as e:
+            print(f"Error fetching {url}: {str(e)}")
+            return e.response.status_code, None
+        except Exception as e:
+            print(f"Error fetching {url}: {str(e)}")
+            return None, None
+
+    def get(self, url, params=None):
+        """Fetch a page and return its HTML, or None if the request failed."""
+        return self.fetch(url, params=params)[1]
+
+    def close(self):
+        """Close the underlying session and its connection pool."""
+        try:
+            self.session.close()
+        except Exception as e:
+            print(f"Error closing HTTP session: {str(e)}")
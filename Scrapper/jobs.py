@@ -0,0 +1,289 @@
+import os
+import uuid
+import heapq
+import logging
+import threading
+import traceback
+from datetime import datetime
+from scraper import CraigslistScraper
+from rate_limiter import HostRateScheduler
+from status import ScrapingStatus
+from progress import ProgressTracker
+
+def run_scrape(scraper, status, logger, resume=False):
+    """
+    Run the listing and detail phases of a scrape, reporting progress in status.
+    
+    Errors are raised to the caller, which records them with mark_failed().
+    """
+    # Resume: skip straight to the details of the last run's links
+    if resume and os.path.exists(scraper.links_file):
+        status.update({
+            "is_running": True,
+            "progress": 50,
+            "current_phase": "Phase 2: Scraping details (resumed)",
+            "last_completed": "Resuming from checkpoint",
+            "completed": False,
+            "error": False,
+            "no_results": False
+        })
+        
+        logger.info("Resuming Phase 2 from the last checkpoint")
+        results_df = scraper.scrape_details(resume=True)
+        
+        logger.info(f"Scraping complete! Total results: {len(results_df)} listings")
+        status.update({
+            "is_running": False,
+            "progress": 100,
+            "current_phase": "Completed",
+            "last_completed": "Scraping Complete",
+            "completed": True,
+            "error": False,
+            "no_results": False
+        })
+        scraper.progress.emit("completed", results=len(results_df))
+        return
+    
+
+    # Phase 1: Scrape listings
+    status.update({
+        "is_running": True,
+        "progress": 0,
+        "current_phase": "Phase 1: Scraping listings",
+        "last_completed": "Starting Phase 1",
+        "completed": False,
+        "error": False,
+        "no_results": False
+    })
+    
+    # Redirect logging
+    logger.info("Phase 1: Starting to scrape listings")
+    
+    # Verify the driver is responsive (the HTTP engine starts it lazily for Phase 2)
+    try:
+        if scraper.engine == 'browser':
+            current_url = scraper.driver.current_url
+            logger.info(f"Driver initialized, current URL: {current_url}")
+        else:
+            logger.info("Using HTTP engine for search pages")
+    except Exception as e:
+        error_msg = f"Error with ChromeDriver: {str(e)}"
+        logger.error(error_msg)
+        status.update({
+            "is_running": False,
+            "current_phase": "Error",
+            "last_completed": error_msg,
+            "error": True,
+            "completed": False
+        })
+        return
+    
+    # Scrape listings
+    logger.info("Scraping listings from configured cities...")
+    df = scraper.scrape_listings()
+    
+    if df is None or df.empty:
+        logger.info("No listings found - scraping complete")
+        status.update({
+            "is_running": False,
+            "progress": 0,
+            "current_phase": "Completed",
+            "last_completed": "No listings found",
+            "completed": True,
+            "error": False,
+            "no_results": True
+        })
+        scraper.progress.emit("completed", results=0)
+        return
+    
+    logger.info(f"Found {len(df)} listings")
+        
+    # Phase 2 - Step 1: Clean listings
+    status.update({
+        "is_running": True,
+        "progress": 30,
+        "current_phase": "Phase 2: Cleaning listings",
+        "last_completed": f"Found {len(df)} listings",
+    })
+    
+    logger.info("Phase 2: Cleaning listings and removing duplicates")
+    df = scraper.clean_listings(df)
+    logger.info(f"After cleaning: {len(df)} unique listings remain")
+    
+    # Phase 2 - Step 2: Scrape details
+    status.update({
+        "is_running": True,
+        "progress": 50,
+        "current_phase": "Phase 2: Scraping details",
+        "last_completed": f"Processing {len(df)} listings",
+    })
+    
+    logger.info(f"Phase 2: Scraping details for {len(df)} listings")
+    results_df = scraper.scrape_details(df)
+    
+    # Update final status
+    logger.info(f"Scraping complete! Total results: {len(results_df)} listings")
+    status.update({
+        "is_running": False,
+        "progress": 100,
+        "current_phase": "Completed",
+        "last_completed": "Scraping Complete",
+        "completed": True,
+        "error": False,
+        "no_results": False
+    })
+    scraper.progress.emit("completed", results=len(results_df))
+
+def mark_failed(status, logger, error, progress=None):
+    """Log a failed scrape and record the error in its status and progress events."""
+    error_msg = f"Error during scraping: {str(error)}"
+    logger.error(error_msg)
+    logger.error(traceback.format_exc())
+    status.update({
+        "is_running": False,
+        "current_phase": "Error",
+        "last_completed": f"Error: {str(error)}",
+        "error": True,
+        "completed": False
+    })
+    if progress is not None:
+        progress.emit("error", message=error_msg, fatal=True)
+
+class ScrapeJob:
+    """A queued scrape with its own configuration, status and output directory."""
+
+    def __init__(self, config, priority=0, output_root="output/jobs"):
+        self.id = uuid.uuid4().hex[:12]
+        self.config = dict(config)
+        self.priority = int(priority)
+        self.output_dir = os.path.join(output_root, self.id)
+        self.status = ScrapingStatus()
+        self.state = "queued"
+        self.created_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        self.started_at = None
+        self.finished_at = None
+        self.scraper = None
+
+    def settings(self, base_config):
+        """Return the scraper settings: the base config overridden by the job's own."""
+        settings = dict(base_config)
+        settings.update(self.config)
+        settings.update({
+            "links_file": os.path.join(self.output_dir, "links.csv"),
+            "output_file": os.path.join(self.output_dir, "results.csv"),
+            "duplicate_clusters_file": os.path.join(self.output_dir, "duplicate_clusters.csv")
+        })
+        return settings
+
+    def to_dict(self, include_status=True):
+        job = {
+            "id": self.id,
+            "state": self.state,
+            "priority": self.priority,
+            "config": self.config,
+            "output_dir": self.output_dir,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at
+        }
+        if include_status:
+            job["status"] = self.status.snapshot()
+        return job
+
+class JobScheduler:
+    """
+    Runs queued scrape jobs, at most max_concurrent at a time.
+
+    Jobs with a higher priority start first; jobs with the same priority run
+    in the order they were submitted. Each running job drives its own browser
+    workers, while all jobs share one per-host rate limiter so that running
+    several jobs doesn't multiply the request rate against a host.
+    """
+
+    def __init__(self, base_config, max_concurrent=None, logger=None, progress_callbacks=None):
+        self.base_config = base_config
+        self.progress_callbacks = list(progress_callbacks or [])
+        self.max_concurrent = max(1, int(max_concurrent or os.getenv('MAX_CONCURRENT_JOBS', 2)))
+        self.logger = logger or logging.getLogger("scraping")
+        self.rate = HostRateScheduler()
+        self._queue = []
+        self._counter = 0
+        self._jobs = {}
+        self._running = 0
+        self._lock = threading.Lock()
+
+    def submit(self, config, priority=0):
+        """Queue a job and return it."""
+        job = ScrapeJob(config, priority)
+        with self._lock:
+            self._jobs[job.id] = job
+            # heapq pops the smallest entry, so negate the priority
+            heapq.heappush(self._queue, (-job.priority, self._counter, job.id))
+            self._counter += 1
+        self.logger.info(f"Queued job {job.id} with priority {job.priority}")
+        self._dispatch()
+        return job
+
+    def _dispatch(self):
+        """Start queued jobs while there is capacity."""
+        with self._lock:
+            while self._queue and self._running < self.max_concurrent:
+                _, _, job_id = heapq.heappop(self._queue)
+                job = self._jobs.get(job_id)
+                if job is None or job.state != "queued":
+                    continue
+                job.state = "running"
+                self._running += 1
+                threading.Thread(target=self._run, args=(job,), name=f"job-{job.id}", daemon=True).start()
+
+    def _run(self, job):
+        job.started_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        job.status["is_running"] = True
+        self.logger.info(f"Starting job {job.id}")
+        progress = ProgressTracker(self.progress_callbacks, job_id=job.id)
+
+        try:
+            os.makedirs(job.output_dir, exist_ok=True)
+            job.scraper = CraigslistScraper(
+                settings=job.settings(self.base_config), status=job.status, rate=self.rate, progress=progress
+            )
+            run_scrape(job.scraper, job.status, self.logger)
+            job.state = "failed" if job.status["error"] else "completed"
+        except Exception as e:
+            mark_failed(job.status, self.logger, e, progress)
+            job.state = "failed"
+        finally:
+            if job.scraper:
+                try:
+                    job.scraper.close()
+                except Exception as e:
+                    self.logger.error(f"Error closing browser of job {job.id}: {str(e)}")
+                job.scraper = None
+
+            job.finished_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            self.logger.info(f"Job {job.id} {job.state}")
+
+            with self._lock:
+                self._running -= 1
+            self._dispatch()
+
+    def get(self, job_id):
+        """Return a job by ID, or None."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list_jobs(self):
+        """Return every job, newest first."""
+        with self._lock:
+            # Jobs are kept in submission order
+            return list(reversed(list(self._jobs.values())))
+
+    def cancel(self, job_id):
+        """Cancel a job that hasn't started yet; return False if it is unknown or already started."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.state != "queued":
+                return False
+            job.state = "cancelled"
+            job.status["current_phase"] = "Cancelled"
+            return True
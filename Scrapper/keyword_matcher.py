@@ -0,0 +1,102 @@
+import re
+import threading
+from collections import Counter
+
+def _normalize(text):
+    """Lowercase text and collapse runs of whitespace into single spaces."""
+    return " ".join(text.lower().split())
+
+def _trie_pattern(node):
+    """Build a regex from a character trie so shared prefixes are only tried once."""
+    branches = []
+    for char in sorted(key for key in node if key != ""):
+        piece = r"\s+" if char == " " else re.escape(char)
+        branches.append(piece + _trie_pattern(node[char]))
+
+    if not branches:
+        return ""
+
+    is_end = "" in node
+    if len(branches) == 1 and not is_end:
+        return branches[0]
+
+    pattern = "(?:" + "|".join(branches) + ")"
+    # The group is optional when a keyword also ends here; greedy so the longest keyword wins
+    return pattern + "?" if is_end else pattern
+
+class KeywordMatcher:
+    """
+    Match a list of keywords against text in a single regex pass.
+
+    The keywords are compiled once into one trie-shaped regex with word
+    boundaries, so "ai" no longer matches inside "email". A plural "s" or
+    "es" after a keyword still matches, so "mobile app" finds "mobile apps".
+    Matching is case insensitive and tolerant of extra whitespace inside
+    multi-word keywords.
+    """
+
+    def __init__(self, keywords):
+        self.keywords = {}
+        for keyword in keywords or []:
+            normalized = _normalize(str(keyword))
+            if normalized and normalized not in self.keywords:
+                self.keywords[normalized] = keyword
+
+        trie = {}
+        for normalized in self.keywords:
+            node = trie
+            for char in normalized:
+                node = node.setdefault(char, {})
+            node[""] = True
+
+        if self.keywords:
+            self._regex = re.compile(r"(?<!\w)" + _trie_pattern(trie) + r"(?:e?s)?(?!\w)", re.IGNORECASE)
+        else:
+            self._regex = None
+
+        # Hits per keyword over the lifetime of the matcher
+        self.hits = Counter()
+        self._lock = threading.Lock()
+
+    def _keyword(self, matched):
+        """Return the configured keyword a matched string belongs to, without its plural suffix."""
+        normalized = _normalize(matched)
+        for candidate in (normalized, normalized[:-1], normalized[:-2]):
+            if candidate in self.keywords:
+                return self.keywords[candidate]
+        return matched
+
+    def _record(self, matches):
+        with self._lock:
+            self.hits.update(matches)
+
+    def find_all(self, text):
+        """Return every keyword occurrence in the text, in order of appearance."""
+        if not text or self._regex is None:
+            return []
+
+        matches = [self._keyword(match.group()) for match in self._regex.finditer(text)]
+        self._record(matches)
+        return matches
+
+    def counts(self, text):
+        """Return how often each keyword occurs in the text."""
+        return Counter(self.find_all(text))
+
+    def search(self, text):
+        """Return the first keyword found in the text, or None."""
+        if not text or self._regex is None:
+            return None
+
+        match = self._regex.search(text)
+        if not match:
+            return None
+
+        keyword = self._keyword(match.group())
+        self._record([keyword])
+        return keyword
+
+    def hit_counts(self):
+        """Return the cumulative hits per keyword, most frequent first."""
+        with self._lock:
+            return dict(self.hits.most_common())
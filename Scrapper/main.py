@@ -2,15 +2,40 @@ import os
 import argparse
 import traceback
 from scraper import CraigslistScraper
+from progress import ProgressTracker, ProgressBar
 from dotenv import load_dotenv
 
+def parse_args():
+    """Parse the command line arguments."""
+    parser = argparse.ArgumentParser(description="Scrape Craigslist job listings")
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Resume the last run from its checkpoint instead of starting over"
+    )
+    return parser.parse_args()
+
 def main():
+    args = parse_args()
+    
     try:
         # Load environment variables
         load_dotenv()
         
         print("Initializing Craigslist Scraper...")
-        scraper = CraigslistScraper()
+        scraper = CraigslistScraper(progress=ProgressTracker([ProgressBar()]))
+        
+        # Resume: reuse the cleaned links of the last run and skip what's checkpointed
+        if args.resume:
+            if os.path.exists(scraper.links_file):
+                print("Resuming detail scraping from the last checkpoint...")
+                results_df = scraper.scrape_details(resume=True)
+                
+                print("Scraping completed successfully!")
+                print(f"Total results saved: {len(results_df)}")
+                return
+            
+            print(f"No links file found at {scraper.links_file}, starting a new run")
         
         print("Starting scraping process...")
         
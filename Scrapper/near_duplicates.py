@@ -0,0 +1,130 @@
+import re
+import zlib
+import numpy as np
+
+# Mersenne prime used by the universal hash functions; keeps products within uint64
+_PRIME = (1 << 31) - 1
+
+def _normalize(text):
+    """Lowercase text and strip emojis, punctuation and extra whitespace."""
+    text = re.sub(r'[^a-z0-9\s]+', ' ', str(text).lower())
+    return " ".join(text.split())
+
+def _choose_bands(num_perm, threshold):
+    """
+    Pick the number of LSH bands and rows per band for a similarity threshold.
+
+    The LSH curve is steepest around (1/bands) ** (1/rows); pick the split whose
+    midpoint is closest to the threshold without going above it, so candidates
+    near the threshold are found and then verified on the full signature.
+    """
+    best = None
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        midpoint = (1 / bands) ** (1 / rows)
+        if midpoint > threshold:
+            continue
+        if best is None or threshold - midpoint < best[0]:
+            best = (threshold - midpoint, bands, rows)
+    return (best[1], best[2]) if best else (num_perm, 1)
+
+class MinHashLSH:
+    """
+    Near-duplicate index over short texts using shingled MinHash and LSH.
+
+    Texts are split into character shingles and reduced to a MinHash
+    signature. Signatures are bucketed by band, so a lookup only compares
+    against texts that share a bucket instead of every text in the index.
+    """
+
+    def __init__(self, threshold=0.8, num_perm=64, shingle_size=3, seed=1):
+        self.threshold = float(threshold)
+        self.num_perm = int(num_perm)
+        self.shingle_size = int(shingle_size)
+        self.bands, self.rows = _choose_bands(self.num_perm, self.threshold)
+
+        generator = np.random.RandomState(seed)
+        self._a = generator.randint(1, _PRIME, size=self.num_perm).astype(np.uint64)
+        self._b = generator.randint(0, _PRIME, size=self.num_perm).astype(np.uint64)
+
+        self._signatures = {}
+        self._buckets = [dict() for _ in range(self.bands)]
+        self._parents = {}
+
+    def __len__(self):
+        return len(self._signatures)
+
+    def _shingles(self, text):
+        text = _normalize(text)
+        if len(text) <= self.shingle_size:
+            return {text} if text else set()
+        return {text[i:i + self.shingle_size] for i in range(len(text) - self.shingle_size + 1)}
+
+    def signature(self, text):
+        """Return the MinHash signature of a text, or None if it has no content."""
+        shingles = self._shingles(text)
+        if not shingles:
+            return None
+
+        hashes = np.array([zlib.crc32(shingle.encode('utf-8')) & _PRIME for shingle in shingles], dtype=np.uint64)
+        permuted = (np.outer(self._a, hashes) + self._b[:, None]) % _PRIME
+        return permuted.min(axis=1).astype(np.uint32)
+
+    def _band_keys(self, signature):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def query(self, text, signature=None):
+        """Return the keys of indexed texts whose estimated similarity meets the threshold."""
+        if signature is None:
+            signature = self.signature(text)
+        if signature is None:
+            return []
+
+        candidates = set()
+        for band, band_key in self._band_keys(signature):
+            candidates.update(self._buckets[band].get(band_key, ()))
+
+        # Verify candidates on the full signature to drop band collisions
+        return [
+            key for key in candidates
+            if np.mean(self._signatures[key] == signature) >= self.threshold
+        ]
+
+    def add(self, key, text):
+        """Index a text and return the keys of the near-duplicates already indexed."""
+        signature = self.signature(text)
+        if signature is None:
+            return []
+
+        matches = self.query(text, signature=signature)
+
+        self._signatures[key] = signature
+        self._parents.setdefault(key, key)
+        for band, band_key in self._band_keys(signature):
+            self._buckets[band].setdefault(band_key, []).append(key)
+
+        for match in matches:
+            self._union(key, match)
+
+        return matches
+
+    def _find(self, key):
+        while self._parents[key] != key:
+            self._parents[key] = self._parents[self._parents[key]]
+            key = self._parents[key]
+        return key
+
+    def _union(self, first, second):
+        first_root, second_root = self._find(first), self._find(second)
+        if first_root != second_root:
+            self._parents[second_root] = first_root
+
+    def clusters(self, min_size=2):
+        """Return the groups of near-duplicate keys with at least min_size members."""
+        groups = {}
+        for key in self._parents:
+            groups.setdefault(self._find(key), []).append(key)
+        return [members for members in groups.values() if len(members) >= min_size]
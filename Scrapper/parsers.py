@@ -0,0 +1,132 @@
+from lxml import html as lxml_html
+
+# Text that Craigslist shows when it is blocking or throttling us
+BLOCK_INDICATORS = [
+    "IP has been automatically blocked",
+    "please solve the CAPTCHA below",
+    "your connection has been limited",
+    "detected unusual activity"
+]
+
+def _has_class(name):
+    """Return an XPath predicate matching elements with the given CSS class."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+# Containers that hold a single search result, in order of preference:
+# div.result-info, li.cl-static-search-result, div.cl-search-result
+_RESULT_XPATHS = [
+    f"//div[{_has_class('result-info')}]",
+    f"//li[{_has_class('cl-static-search-result')}]",
+    f"//div[{_has_class('cl-search-result')}]"
+]
+
+# Anchors that hold the title and link of a result, falling back to the first link
+_TITLE_XPATHS = [
+    f".//a[{_has_class('posting-title')}]",
+    f".//a[{_has_class('title')}]",
+    f".//a[{_has_class('cl-app-anchor')}]",
+    ".//a[@data-testid='listing-title']",
+    ".//a[@href]"
+]
+
+# Elements that may hold the post date of a result
+_DATE_XPATHS = [
+    f".//div[{_has_class('meta')}]/span[1]",
+    ".//time",
+    ".//span[@data-testid='listing-date']",
+    f".//span[{_has_class('date')}]",
+    f".//*[{_has_class('meta')}]//*[{_has_class('pl')}]",
+    f".//*[{_has_class('result-date')}]"
+]
+
+def is_blocked_page(page_source):
+    """Check if the page source contains any of the blocking indicators."""
+    if not page_source:
+        return False
+
+    page_source = page_source.lower()
+    return any(indicator.lower() in page_source for indicator in BLOCK_INDICATORS)
+
+def _element_text(element):
+    """Return the whitespace-normalized text content of an element."""
+    return " ".join(element.text_content().split())
+
+def _extract_title(element):
+    """Return the title and link of a search result element."""
+    for xpath in _TITLE_XPATHS:
+        anchors = element.xpath(xpath)
+        if not anchors:
+            continue
+
+        anchor = anchors[0]
+        link = anchor.get("href")
+
+        # Static results wrap the title in a div inside the anchor
+        title_divs = anchor.xpath(f".//div[{_has_class('title')}]")
+        if title_divs:
+            title = _element_text(title_divs[0])
+        else:
+            title = _element_text(anchor)
+
+        if not title:
+            title = (element.get("title") or "").strip()
+
+        return title, link
+
+    return None, None
+
+def _extract_post_date(element):
+    """Return the post date of a search result element."""
+    for xpath in _DATE_XPATHS:
+        date_elements = element.xpath(xpath)
+        if not date_elements:
+            continue
+
+        # Prefer the title attribute, fall back to the text content
+        date_value = date_elements[0].get("title") or _element_text(date_elements[0])
+        if date_value:
+            return date_value
+
+    datetime_elements = element.xpath(".//*[@datetime]")
+    if datetime_elements and datetime_elements[0].get("datetime"):
+        return datetime_elements[0].get("datetime")
+
+    return "Unknown"
+
+def parse_search_results(page_source, base_url=None):
+    """
+    Parse a Craigslist search page into a list of result records.
+
+    Each record is a dict with 'Title', 'Link' and 'Post Date' keys.
+    """
+    if not page_source:
+        return []
+
+    try:
+        document = lxml_html.fromstring(page_source)
+    except Exception as e:
+        print(f"Error parsing search page: {str(e)}")
+        return []
+
+    if base_url:
+        document.make_links_absolute(base_url)
+
+    result_elements = []
+    for xpath in _RESULT_XPATHS:
+        result_elements = document.xpath(xpath)
+        if result_elements:
+            break
+
+    records = []
+    for element in result_elements:
+        title, link = _extract_title(element)
+        if not title or not link:
+            continue
+
+        records.append({
+            "Title": title,
+            "Link": link,
+            "Post Date": _extract_post_date(element)
+        })
+
+    return records
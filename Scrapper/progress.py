@@ -0,0 +1,155 @@
+import time
+import asyncio
+import threading
+from collections import deque
+from utils import create_progress_bar
+
+class ProgressTracker:
+    """
+    Progress callback interface of the scraper.
+
+    The scraper reports phases, finished items and notable events (blocks,
+    retries, errors) here. The tracker adds the phase, counts, throughput
+    and ETA, and passes each event as a dict to every callback. A callback is
+    any callable taking that dict, e.g. an EventBroker or a ProgressBar.
+    """
+
+    def __init__(self, callbacks=None, window=50, **context):
+        self.callbacks = list(callbacks or [])
+        # Extra fields added to every event, e.g. the job_id of a scrape job
+        self.context = context
+        self.phase = None
+        self.total = None
+        self.done = 0
+        self._started = None
+        self._recent = deque(maxlen=max(2, int(window)))
+        self._lock = threading.Lock()
+
+    def add_callback(self, callback):
+        self.callbacks.append(callback)
+
+    def _rate(self, now):
+        """Return finished items per minute, over the recent window."""
+        if not self._recent:
+            return 0.0
+        if self.done > len(self._recent):
+            # Measure over the recent window only, so the rate follows slowdowns
+            count, since = len(self._recent) - 1, self._recent[0]
+        else:
+            count, since = len(self._recent), self._started
+        elapsed = now - since
+        return count / elapsed * 60 if count and elapsed > 0 else 0.0
+
+    def _counts(self, now):
+        per_minute = self._rate(now)
+        remaining = None if self.total is None else max(0, self.total - self.done)
+        eta = remaining / per_minute * 60 if remaining is not None and per_minute > 0 else None
+        return {
+            "done": self.done,
+            "total": self.total,
+            "per_minute": round(per_minute, 2),
+            "eta_seconds": round(eta) if eta is not None else None,
+            "elapsed_seconds": round(now - self._started) if self._started else 0
+        }
+
+    def start_phase(self, phase, total=None):
+        """Start counting a new phase of total items."""
+        with self._lock:
+            self.phase = phase
+            self.total = total
+            self.done = 0
+            self._started = time.monotonic()
+            self._recent.clear()
+            counts = self._counts(self._started)
+        self.emit("phase", **counts)
+
+    def advance(self, event="progress", count=1, **data):
+        """Count finished items and emit an event with throughput and ETA."""
+        with self._lock:
+            now = time.monotonic()
+            self.done += count
+            for _ in range(count):
+                self._recent.append(now)
+            counts = self._counts(now)
+        data.update(counts)
+        self.emit(event, **data)
+
+    def emit(self, event, **data):
+        """Send an event to every callback; a failing callback never stops the scrape."""
+        payload = {"event": event, "phase": self.phase, "time": time.time()}
+        payload.update(self.context)
+        payload.update(data)
+
+        for callback in self.callbacks:
+            try:
+                callback(payload)
+            except Exception as e:
+                print(f"Error in progress callback: {str(e)}")
+
+class ProgressBar:
+    """Callback that shows each counted phase as a console progress bar."""
+
+    def __init__(self):
+        self._bar = None
+
+    def _close(self):
+        if self._bar is not None and hasattr(self._bar, 'close'):
+            self._bar.close()
+        self._bar = None
+
+    def __call__(self, event):
+        if event["event"] == "phase":
+            self._close()
+            if event.get("total"):
+                self._bar = create_progress_bar(event["total"], desc=event["phase"])
+        elif event["event"] == "completed":
+            self._close()
+        elif "done" in event and self._bar is not None and hasattr(self._bar, 'update'):
+            self._bar.update(event["done"] - self._bar.n)
+
+class EventBroker:
+    """
+    Callback that fans events out to asyncio subscribers, e.g. SSE streams.
+
+    Events are published from scraper threads and handed to each
+    subscriber's event loop thread-safely. A slow subscriber loses its
+    oldest events rather than holding up the scrape.
+    """
+
+    def __init__(self, history=100, queue_size=1000):
+        self.queue_size = queue_size
+        self._history = deque(maxlen=history)
+        self._subscribers = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, loop, replay=True):
+        """Return a new asyncio.Queue receiving events, pre-filled with the recent ones."""
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        with self._lock:
+            if replay:
+                for event in self._history:
+                    queue.put_nowait(event)
+            self._subscribers[queue] = loop
+        return queue
+
+    def unsubscribe(self, queue):
+        with self._lock:
+            self._subscribers.pop(queue, None)
+
+    @staticmethod
+    def _deliver(queue, event):
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(event)
+
+    def __call__(self, event):
+        with self._lock:
+            self._history.append(event)
+            subscribers = list(self._subscribers.items())
+
+        for queue, loop in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._deliver, queue, event)
+            except RuntimeError:
+                # The subscriber's loop is closed
+                self.unsubscribe(queue)
@@ -0,0 +1,111 @@
+import os
+import time
+import random
+import threading
+from urllib.parse import urlparse
+
+class HostRateScheduler:
+    """
+    Token-bucket rate limiter keyed by host, with AIMD rate control.
+
+    Every network action calls acquire() first, which only sleeps as long as
+    the host's bucket needs to refill. Each clean page load raises the host's
+    rate additively; a block or failure cuts it multiplicatively.
+    """
+
+    def __init__(self, initial_rate=None, min_rate=None, max_rate=None, increase=None, decrease=None, burst=1):
+        # Rates are in requests per second per host
+        self.initial_rate = float(initial_rate if initial_rate is not None else os.getenv('RATE_INITIAL', 0.3))
+        self.min_rate = float(min_rate if min_rate is not None else os.getenv('RATE_MIN', 0.05))
+        self.max_rate = float(max_rate if max_rate is not None else os.getenv('RATE_MAX', 2.0))
+        self.increase = float(increase if increase is not None else os.getenv('RATE_INCREASE', 0.05))
+        self.decrease = float(decrease if decrease is not None else os.getenv('RATE_DECREASE', 0.5))
+        self.burst = max(1, int(burst))
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def _host_key(self, url):
+        """Return the host a URL belongs to, e.g. 'gadsden.craigslist.org'."""
+        try:
+            return urlparse(url).hostname or "unknown"
+        except Exception:
+            return "unknown"
+
+    def _state(self, host):
+        """Return the bucket of a host, creating it on first use."""
+        state = self._hosts.get(host)
+        if state is None:
+            state = {
+                "rate": self.initial_rate,
+                "tokens": float(self.burst),
+                "updated": time.monotonic(),
+                "successes": 0,
+                "failures": 0,
+                "cool_until": 0.0
+            }
+            self._hosts[host] = state
+        return state
+
+    def acquire(self, url):
+        """Wait until a request to the URL's host is allowed and return the time waited."""
+        host = self._host_key(url)
+
+        with self._lock:
+            state = self._state(host)
+            now = time.monotonic()
+
+            # Refill the bucket for the time that has passed
+            elapsed = now - state["updated"]
+            state["tokens"] = min(float(self.burst), state["tokens"] + elapsed * state["rate"])
+            state["updated"] = now
+
+            # Reserve a token; a negative balance is the time we owe
+            state["tokens"] -= 1
+            wait = max(0.0, -state["tokens"] / state["rate"], state["cool_until"] - now)
+
+        if wait > 0:
+            # A little jitter keeps parallel workers from firing in lockstep
+            wait *= random.uniform(1.0, 1.2)
+            time.sleep(wait)
+
+        return wait
+
+    def record_success(self, url):
+        """Additively raise the host's rate after a clean page load."""
+        with self._lock:
+            state = self._state(self._host_key(url))
+            state["rate"] = min(self.max_rate, state["rate"] + self.increase)
+            state["successes"] += 1
+
+    def record_failure(self, url):
+        """Multiplicatively cut the host's rate after a block or failed load."""
+        with self._lock:
+            state = self._state(self._host_key(url))
+            state["rate"] = max(self.min_rate, state["rate"] * self.decrease)
+            # Drain the bucket so the next request waits a full interval
+            state["tokens"] = min(state["tokens"], 0.0)
+            state["failures"] += 1
+
+    def cool_down(self, url, seconds):
+        """Hold back every request to the URL's host for the given number of seconds, e.g. after a CAPTCHA."""
+        with self._lock:
+            state = self._state(self._host_key(url))
+            state["cool_until"] = max(state["cool_until"], time.monotonic() + seconds)
+
+    def cool_down_remaining(self, url):
+        """Return the seconds left of the host's cool-down, or 0."""
+        with self._lock:
+            state = self._hosts.get(self._host_key(url))
+            return max(0.0, state["cool_until"] - time.monotonic()) if state else 0.0
+
+    def stats(self):
+        """Return the current rate and counters of every host."""
+        with self._lock:
+            return {
+                host: {
+                    "rate": round(state["rate"], 3),
+                    "successes": state["successes"],
+                    "failures": state["failures"]
+                }
+                for host, state in self._hosts.items()
+            }
@@ -0,0 +1,87 @@
+import os
+import time
+import random
+import threading
+
+class RetryQueue:
+    """
+    Thread-safe queue of work items parked for a later retry.
+
+    Workers park what they could not finish (e.g. a listing that hit a
+    CAPTCHA or timed out) and move on; the parked items are retried after
+    the main pass. Each retry of the same key waits exponentially longer,
+    with jitter so retries don't hit the host in lockstep. Items that fail
+    more than max_attempts times end up in the dead letters.
+    """
+
+    def __init__(self, max_attempts=3, base_delay=None, max_delay=None):
+        self.max_attempts = max(1, int(max_attempts))
+        self.base_delay = float(base_delay if base_delay is not None else os.getenv('RETRY_BASE_DELAY', 5))
+        self.max_delay = float(max_delay if max_delay is not None else os.getenv('RETRY_MAX_DELAY', 300))
+        self._items = []
+        self._attempts = {}
+        self._dead = []
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._items)
+
+    def _delay(self, attempts):
+        """Return the backoff before the given attempt, with equal jitter."""
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempts - 1))
+        return random.uniform(delay / 2, delay)
+
+    def park(self, key, item, reason=None, delay=0, count=True):
+        """
+        Park an item for a retry, keyed by e.g. its link.
+
+        The retry waits at least delay seconds, e.g. for its host to cool
+        down. Returns False, and moves the item to the dead letters, once the
+        key has failed more than max_attempts times. count=False defers the
+        item without using up an attempt.
+        """
+        with self._lock:
+            attempts = self._attempts.get(key, 0) + (1 if count else 0)
+            self._attempts[key] = attempts
+
+            if attempts > self.max_attempts:
+                self._dead.append((key, item, reason, attempts))
+                return False
+
+            wait = max(delay or 0, self._delay(max(1, attempts)))
+            self._items.append((time.monotonic() + wait, key, item, reason))
+            return True
+
+    def next_batch(self):
+        """
+        Wait until the earliest parked item is due and return every due item.
+
+        Returns a list of (key, item, reason) tuples, or an empty list when
+        nothing is parked.
+        """
+        with self._lock:
+            if not self._items:
+                return []
+            wait = min(ready_at for ready_at, _, _, _ in self._items) - time.monotonic()
+
+        if wait > 0:
+            time.sleep(wait)
+
+        with self._lock:
+            now = time.monotonic()
+            due = [entry for entry in self._items if entry[0] <= now]
+            self._items = [entry for entry in self._items if entry[0] > now]
+        return [(key, item, reason) for _, key, item, reason in due]
+
+    def drain(self):
+        """Remove and return every parked (key, item, reason) tuple without waiting."""
+        with self._lock:
+            items, self._items = self._items, []
+        return [(key, item, reason) for _, key, item, reason in items]
+
+    def dead_letters(self):
+        """Remove and return the (key, item, reason, attempts) tuples that ran out of attempts."""
+        with self._lock:
+            dead, self._dead = self._dead, []
+        return dead
@@ -0,0 +1,211 @@
+import os
+import uuid
+import threading
+from datetime import datetime, timedelta
+
+# Ranges of the five cron fields: minute, hour, day of month, month, day of week (0 and 7 = Sunday)
+_CRON_FIELDS = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+
+def _parse_field(field, low, high):
+    """Return the set of values a single cron field allows."""
+    values = set()
+    for part in field.split(','):
+        step = 1
+        if '/' in part:
+            part, step = part.split('/', 1)
+            step = int(step)
+            if step < 1:
+                raise ValueError(f"Invalid cron step: {field}")
+
+        if part == '*':
+            start, end = low, high
+        elif '-' in part:
+            start, end = (int(value) for value in part.split('-', 1))
+        else:
+            start = end = int(part)
+
+        if start < low or end > high or start > end:
+            raise ValueError(f"Cron field {field} is outside {low}-{high}")
+        values.update(range(start, end + 1, step))
+    return values
+
+class CronExpression:
+    """
+    A standard five-field cron expression, e.g. "0 */6 * * *" for every six hours.
+
+    Fields support *, lists (1,15), ranges (1-5) and steps (*/10). When both
+    day of month and day of week are restricted, either one matching is
+    enough, as in cron.
+    """
+
+    def __init__(self, expression):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression must have 5 fields: {expression}")
+
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, weekdays = (
+            _parse_field(field, low, high) for field, (low, high) in zip(fields, _CRON_FIELDS)
+        )
+        # Sunday may be written as 0 or 7
+        self.weekdays = {weekday % 7 for weekday in weekdays}
+        self._any_day = fields[2] == '*'
+        self._any_weekday = fields[4] == '*'
+
+    def _day_matches(self, moment):
+        weekday = (moment.weekday() + 1) % 7
+        if self._any_day or self._any_weekday:
+            return moment.day in self.days and weekday in self.weekdays
+        return moment.day in self.days or weekday in self.weekdays
+
+    def matches(self, moment):
+        """Return True if the expression fires at the given minute."""
+        return (moment.minute in self.minutes and moment.hour in self.hours
+                and moment.month in self.months and self._day_matches(moment))
+
+    def next_after(self, moment):
+        """Return the first minute after moment at which the expression fires."""
+        moment = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = moment + timedelta(days=366 * 4)
+
+        while moment < limit:
+            # Skip whole days and hours that can't match instead of testing every minute
+            if moment.month not in self.months or not self._day_matches(moment):
+                moment = (moment + timedelta(days=1)).replace(hour=0, minute=0)
+                continue
+            if moment.hour not in self.hours:
+                moment = (moment + timedelta(hours=1)).replace(minute=0)
+                continue
+            if moment.minute in self.minutes:
+                return moment
+            moment += timedelta(minutes=1)
+
+        raise ValueError(f"Cron expression never fires: {self.expression}")
+
+def _format(moment):
+    return moment.strftime('%Y-%m-%d %H:%M:%S') if moment else None
+
+def _parse(value):
+    return datetime.strptime(value, '%Y-%m-%d %H:%M:%S') if value else None
+
+class RecurringScheduler:
+    """
+    Submits scrape jobs on cron schedules.
+
+    Schedules are persisted in the listing store, so they survive restarts.
+    Runs are incremental by default: each city only pages back to the
+    watermark of the last run with the same keywords, and results are
+    merged into the store.
+    A schedule whose previous job is still queued or running skips its turn.
+    """
+
+    def __init__(self, job_scheduler, store, check_interval=None):
+        self.job_scheduler = job_scheduler
+        self.store = store
+        self.check_interval = float(check_interval or os.getenv('SCHEDULE_CHECK_INTERVAL', 30))
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def add(self, cron, config=None, priority=0, name=None, enabled=True):
+        """Create a schedule and return it."""
+        expression = CronExpression(cron)
+
+        config = dict(config or {})
+        config.setdefault('incremental', True)
+
+        schedule = {
+            "id": uuid.uuid4().hex[:12],
+            "name": name,
+            "cron": cron,
+            "config": config,
+            "priority": int(priority),
+            "enabled": bool(enabled),
+            "last_run": None,
+            "next_run": _format(expression.next_after(datetime.now())),
+            "last_job_id": None,
+            "created_at": _format(datetime.now())
+        }
+        with self._lock:
+            self.store.save_schedule(schedule)
+        return schedule
+
+    def list_schedules(self):
+        """Return every schedule."""
+        with self._lock:
+            return self.store.get_schedules()
+
+    def get(self, schedule_id):
+        """Return a schedule by ID, or None."""
+        for schedule in self.list_schedules():
+            if schedule["id"] == schedule_id:
+                return schedule
+        return None
+
+    def set_enabled(self, schedule_id, enabled):
+        """Pause or resume a schedule, returning the updated schedule or None."""
+        with self._lock:
+            schedule = next((s for s in self.store.get_schedules() if s["id"] == schedule_id), None)
+            if schedule is None:
+                return None
+            schedule["enabled"] = bool(enabled)
+            if enabled:
+                schedule["next_run"] = _format(CronExpression(schedule["cron"]).next_after(datetime.now()))
+            self.store.save_schedule(schedule)
+            return schedule
+
+    def remove(self, schedule_id):
+        """Delete a schedule; return False if it doesn't exist."""
+        with self._lock:
+            return self.store.delete_schedule(schedule_id)
+
+    def _previous_job_active(self, schedule):
+        job = self.job_scheduler.get(schedule["last_job_id"]) if schedule["last_job_id"] else None
+        return job is not None and job.state in ("queued", "running")
+
+    def run_due(self, now=None):
+        """Submit a job for every enabled schedule that is due and return the job IDs."""
+        now = now or datetime.now()
+        submitted = []
+
+        with self._lock:
+            for schedule in self.store.get_schedules():
+                next_run = _parse(schedule["next_run"])
+                if not schedule["enabled"] or next_run is None or next_run > now:
+                    continue
+
+                if self._previous_job_active(schedule):
+                    print(f"Schedule {schedule['id']} skipped: its previous job is still running")
+                else:
+                    job = self.job_scheduler.submit(schedule["config"], priority=schedule["priority"])
+                    schedule["last_job_id"] = job.id
+                    schedule["last_run"] = _format(now)
+                    submitted.append(job.id)
+
+                # Runs missed while the server was down are not caught up one by one
+                schedule["next_run"] = _format(CronExpression(schedule["cron"]).next_after(now))
+                self.store.save_schedule(schedule)
+
+        return submitted
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                self.run_due()
+            except Exception as e:
+                print(f"Error running scheduled scrapes: {str(e)}")
+            self._stop.wait(self.check_interval)
+
+    def start(self):
+        """Start checking the schedules in a background thread."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="schedules", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background thread."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
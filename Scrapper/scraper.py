@@ -1,93 +1,257 @@
 import re
 import time
 import os
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
+import json
+import hashlib
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from webdriver_manager.chrome import ChromeDriverManager
 import pandas as pd
 import importlib
-from utils import random_delay, save_to_csv, load_from_csv, remove_duplicates, get_random_user_agent
+from utils import save_to_csv, load_from_csv, remove_duplicates, extract_posting_id, build_search_url, build_query_groups
+from fetcher import HttpFetcher, BLOCK_STATUS_CODES
+from browser import create_driver, apply_resource_blocking, standby
+from parsers import parse_search_results, is_blocked_page, BLOCK_INDICATORS
 import traceback
 import shutil
+import threading
+from collections import deque
 from datetime import datetime
+from worker_pool import WorkerPool
+from rate_limiter import HostRateScheduler
+from keyword_matcher import KeywordMatcher
+from store import ListingStore, DETAIL_COLUMNS
+from checkpoint import CheckpointWriter
+from seen_index import SeenIndex, listing_key
+from near_duplicates import MinHashLSH
+from selector_resolver import resolver
+from block_monitor import BlockMonitor
+from retry_queue import RetryQueue
+from status import scraping_status
+from progress import ProgressTracker
+
+# Layout variants of the elements the detail flow works with
+DESCRIPTION_SELECTORS = ["#postingbody", "section#postingbody", "div[data-testid='postingbody']"]
+REPLY_SELECTORS = ["button.reply-button", "button[data-href*='/reply/']", "a.reply-button", "a[href*='/reply/']"]
+EMAIL_BUTTON_SELECTORS = ["button.reply-option-header", "button[class*='reply-email']", "div[class*='reply-email']"]
+EMAIL_CONTAINER_SELECTORS = ["div.reply-content-email", "div[class*='reply-email']", "div.reply-info"]
+EMAIL_SELECTORS = ["div.reply-email-address a", "a[href^='mailto:']", "a[class*='email']"]
+
+# Elements that mark a page as usable, so loads don't wait for the full page
+SEARCH_RESULTS_SELECTOR = "div.result-info, li.cl-static-search-result, div.cl-search-result"
+POSTING_BODY_SELECTOR = ", ".join(DESCRIPTION_SELECTORS)
+CAPTCHA_SELECTOR = "iframe[src*='captcha'], #g-recaptcha-response, .g-recaptcha, .h-captcha"
+
+# Resolves with "found" once an element matches arguments[0], "blocked" once one
+# matches arguments[1], or null after arguments[2] ms. A MutationObserver reacts to
+# the DOM update itself, so nothing is polled over the WebDriver connection.
+WAIT_FOR_ELEMENT_SCRIPT = """
+const selector = arguments[0], blockSelector = arguments[1], timeoutMs = arguments[2];
+const done = arguments[arguments.length - 1];
+const check = () => {
+    if (blockSelector && document.querySelector(blockSelector)) return "blocked";
+    return document.querySelector(selector) ? "found" : null;
+};
+const initial = check();
+if (initial) { done(initial); return; }
+let timer = null;
+const observer = new MutationObserver(() => {
+    const outcome = check();
+    if (outcome) { observer.disconnect(); clearTimeout(timer); done(outcome); }
+});
+observer.observe(document.documentElement, {childList: true, subtree: true, attributes: true});
+timer = setTimeout(() => { observer.disconnect(); done(null); }, timeoutMs);
+"""
+
+# Checks a page for block/CAPTCHA signs inside the browser and returns only a
+# small summary, instead of transferring the whole DOM through page_source
+PROBE_PAGE_SCRIPT = """
+const text = document.body ? document.body.textContent.toLowerCase() : "";
+return {
+    title: document.title,
+    captcha: !!document.querySelector(arguments[0]),
+    indicator: arguments[1].find(indicator => text.includes(indicator)) || null
+};
+"""
+
+# Page text that means a CAPTCHA is still waiting to be solved
+CAPTCHA_TEXTS = ["captcha", "robot", "human verification", "prove you're human"]
+
+def _posting_number(link):
+    """Return the posting ID of a link as an integer, or None."""
+    posting_id = extract_posting_id(link)
+    return int(posting_id) if posting_id else None
 
 class CraigslistScraper:
-    def __init__(self):
+    def __init__(self, settings=None, status=None, rate=None, progress=None):
+        # Runtime settings (e.g. the API's current_config or a job's config) override environment variables
+        settings = settings or {}
+        
+        # Progress is reported to the given status, e.g. a job's, or else the API's shared one
+        self.status = status if status is not None else scraping_status
+        
+        # Fine-grained progress events (listings per city, details done, throughput, blocks, errors)
+        self.progress = progress or ProgressTracker()
+        
         # Reload config module to get fresh values
         import config
         importlib.reload(config)
         
         # Get the latest config values
-        self.cities = config.CRAIGSLIST_CITIES
-        self.base_url = config.CRAIGSLIST_BASE_URL
-        self.keywords = config.KEYWORDS
-        self.remote_keywords = config.REMOTE_KEYWORDS
-        self.non_remote_keywords = config.NON_REMOTE_KEYWORDS
+        self.cities = settings.get('cities') or config.CRAIGSLIST_CITIES
+        self.base_url = settings.get('base_url') or config.CRAIGSLIST_BASE_URL
+        self.keywords = settings.get('keywords') or config.KEYWORDS
+        self.remote_keywords = settings.get('remote_keywords') or config.REMOTE_KEYWORDS
+        self.non_remote_keywords = settings.get('non_remote_keywords') or config.NON_REMOTE_KEYWORDS
+        
+        # Compile the keyword lists once for single-pass matching
+        self.keyword_matcher = KeywordMatcher(self.keywords)
+        self.remote_matcher = KeywordMatcher(self.remote_keywords)
+        self.non_remote_matcher = KeywordMatcher(self.non_remote_keywords)
         
         # Initialize attributes
         self.driver = None
         self._captcha_detected = False
-        self.use_headless = os.getenv('USE_HEADLESS', 'false').lower() == 'true'
+        
+        # Name of the browser/session the scraper works with, used to attribute blocks
+        self.identity = "worker-0"
+        self.current_city = None
+        
+        # Set when the current city/listing ran into a block and was parked
+        self._blocked = False
+        self._search_failed = False
+        self.use_headless = settings.get('use_headless', os.getenv('USE_HEADLESS', 'false').lower() == 'true')
+        
+        # Lean browsing skips images, CSS, fonts and media and stops waiting at DOMContentLoaded
+        self.lean_browser = settings.get('lean_browser', os.getenv('LEAN_BROWSER', 'true').lower() == 'true')
+        
+        # "http" fetches search pages without a browser, "browser" uses Selenium for everything
+        self.engine = settings.get('engine', os.getenv('SCRAPE_ENGINE', 'http')).lower()
+        self.http = None
         
         # Ensure output directory exists
         os.makedirs('output', exist_ok=True)
         
         # Initialize paths and settings
-        self.links_file = os.getenv('LINKS_FILE', 'output/links.csv')
+        self.links_file = settings.get('links_file', os.getenv('LINKS_FILE', 'output/links.csv'))
         self.history_links_file = os.getenv('HISTORY_LINKS_FILE', 'history_links.csv')
-        self.output_file = os.getenv('OUTPUT_FILE', 'output/results.csv')
-        self.batch_size = int(os.getenv('BATCH_SIZE', 10))
-        self.max_retries = int(os.getenv('MAX_RETRIES', 3))
+        self.output_file = settings.get('output_file', os.getenv('OUTPUT_FILE', 'output/results.csv'))
+        self.batch_size = int(settings.get('batch_size', os.getenv('BATCH_SIZE', 10)))
+        self.max_retries = int(settings.get('max_retries', os.getenv('MAX_RETRIES', 3)))
+        
+        # Number of checkpointed results between fsyncs of the output file
+        self.fsync_interval = int(settings.get('fsync_interval', os.getenv('CHECKPOINT_FSYNC_INTERVAL', self.batch_size)))
+        
+        # Number of independent browser workers used to split cities and detail links
+        self.workers = max(1, int(settings.get('workers', os.getenv('WORKERS', 1))))
+        
+        # Number of tabs each worker's browser keeps loading listing pages in
+        self.tabs = max(1, int(settings.get('tabs', os.getenv('TABS_PER_WORKER', 1))))
             
-        # Ensure the history file exists
-        if not os.path.exists(self.history_links_file):
-            # Create an empty history file with headers if it doesn't exist
-            with open(self.history_links_file, 'w', encoding='utf-8') as f:
-                f.write('link,city,title,date_scraped\n')
+        # Listings, details and link history live in an embedded SQLite store
+        self.store = ListingStore(settings.get('db_file'))
+        
+        # Carry over the history of runs from before the store existed
+        if self.store.history_count() == 0 and os.path.exists(self.history_links_file):
+            imported = self.store.import_history_csv(self.history_links_file)
+            print(f"Imported {imported} links from {self.history_links_file} into the history store")
         
-        # If output/links.csv exists, copy its contents to history_links.csv
+        # Maximum number of result pages walked per city
+        self.max_pages = max(1, int(settings.get('max_pages', os.getenv('MAX_SEARCH_PAGES', 10))))
+        
+        # Incremental runs stop paging at each city's newest posting from the last run
+        self.incremental = settings.get('incremental', os.getenv('INCREMENTAL', 'false').lower() == 'true')
+        
+        # Renewed postings keep their old ID, so a single old record doesn't end the walk;
+        # paging stops after this many consecutive records at or below the watermark
+        self.watermark_stop_run = max(1, int(settings.get('watermark_stop_run', os.getenv('WATERMARK_STOP_RUN', 25))))
+        
+        # Send the keywords to Craigslist as OR-queries instead of fetching every listing
+        self.search_query = settings.get('search_query', os.getenv('SEARCH_QUERY', 'false').lower() == 'true')
+        
+        # Watermarks only apply to runs that search and filter the same way
+        self.watermark_scope = self._watermark_scope()
+        
+        # Postings scraped in earlier runs are skipped unless skip_seen is off
+        self.skip_seen = settings.get('skip_seen', os.getenv('SKIP_SEEN', 'true').lower() == 'true')
+        self.seen = SeenIndex(self.store)
+        
+        # Similarity above which titles/descriptions count as near-duplicates (0 disables)
+        self.near_dup_threshold = float(settings.get('near_dup_threshold', os.getenv('NEAR_DUP_THRESHOLD', 0.8)))
+        self.near_dup_history = int(os.getenv('NEAR_DUP_HISTORY_LIMIT', 100000))
+        self.duplicate_clusters_file = settings.get('duplicate_clusters_file', os.getenv('DUPLICATE_CLUSTERS_FILE', 'output/duplicate_clusters.csv'))
+        
+        # If output/links.csv exists, copy its contents to the history
         if os.path.exists(self.links_file):
-            self._update_history_file()
+            self._update_history()
+        
+        # Setup the driver up front only when search pages need it; otherwise it
+        # is started lazily for the detail phase
+        if self.engine == 'browser':
+            self.driver = self._setup_driver()
+        else:
+            self.http = HttpFetcher(max_retries=self.max_retries, pool_size=max(10, self.workers))
         
-        # Setup the driver
-        self.driver = self._setup_driver()
+        # Per-host request pacing shared by all workers (and by all jobs when one is passed in)
+        self.rate = rate or HostRateScheduler()
+        
+        # Block and CAPTCHA events per city and identity, shared by all workers
+        self.blocks = BlockMonitor()
+        
+        # "quarantine" parks blocked work and cools down the blocked host; "wait" waits for a person to solve the CAPTCHA
+        self.captcha_mode = settings.get('captcha_mode', os.getenv('CAPTCHA_MODE', 'quarantine')).lower()
+        self.quarantine_seconds = float(os.getenv('QUARANTINE_SECONDS', 120))
+        
+        # Cities and listings parked after a block or failure, retried with backoff after the main pass
+        self.city_retries = RetryQueue(max_attempts=self.max_retries)
+        self.listing_retries = RetryQueue(max_attempts=self.max_retries)
+        
+        self.pool = WorkerPool(self, self.workers)
+        
+    def _ensure_driver(self):
+        """Start the Chrome WebDriver if it isn't running yet and return it."""
+        if self.driver is None:
+            self.driver = self._setup_driver()
+        return self.driver
         
     def _setup_driver(self):
         """Set up and return a Chrome WebDriver instance."""
         try:
-            chrome_options = Options()
-            if self.use_headless:
-                chrome_options.add_argument("--headless=new")
-            
-            # Add Chrome options for stability
-            chrome_options.add_argument("--window-size=1920,1080")
-            chrome_options.add_argument("--disable-notifications")
-            chrome_options.add_argument("--disable-extensions")
-            chrome_options.add_argument("--disable-gpu")
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument(f"user-agent={get_random_user_agent()}")
-            
-            # Use webdriver_manager to handle ChromeDriver installation
-            driver_path = ChromeDriverManager().install()
-            service = Service(driver_path)
-            
-            # Create driver 
-            driver = webdriver.Chrome(service=service, options=chrome_options)
-            driver.set_page_load_timeout(30)
-            return driver
+            # Use the pre-warmed standby driver when there is one
+            driver = standby.take(self.use_headless, self.lean_browser)
+            if driver is not None:
+                return driver
+            
+            # The ChromeDriver path is resolved once and cached
+            return create_driver(self.use_headless, self.lean_browser)
             
         except Exception as e:
             print(f"Error setting up Chrome WebDriver: {str(e)}")
             raise
     
-    def _load_page_with_retry(self, url, max_retries=None):
-        """Load a page with retries for reliability."""
+    def _wait_until_usable(self, wait_for=None, timeout=10):
+        """
+        Wait until the element the caller needs is present, or the DOM is parsed.
+        
+        Returns False only if the document is still loading after the timeout.
+        """
+        try:
+            if wait_for:
+                WebDriverWait(self.driver, timeout).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, wait_for))
+                )
+            else:
+                WebDriverWait(self.driver, timeout).until(
+                    lambda driver: driver.execute_script("return document.readyState") != "loading"
+                )
+            return True
+        except TimeoutException:
+            # Pages without the element (removed postings, blocks) are still usable once parsed
+            return self.driver.execute_script("return document.readyState") != "loading"
+    
+    def _load_page_with_retry(self, url, max_retries=None, wait_for=None):
+        """Load a page with retries, waiting for the wait_for CSS selector if given."""
         if max_retries is None:
             max_retries = self.max_retries
             
@@ -95,15 +259,17 @@ class CraigslistScraper:
             return False
             
         for attempt in range(max_retries):
+            # Wait for the host's rate limit before hitting the network
+            self.rate.acquire(url)
             try:
                 self.driver.get(url)
-                WebDriverWait(self.driver, 10).until(
-                    lambda driver: driver.execute_script("return document.readyState") == "complete"
-                )
+                if not self._wait_until_usable(wait_for):
+                    raise TimeoutException(f"Page did not load: {url}")
+                self.rate.record_success(url)
                 return True
             except Exception as e:
-                if attempt < max_retries - 1:
-                    random_delay(3, 5)
+                # Back off this host before the next attempt
+                self.rate.record_failure(url)
         
         return False
 
@@ -112,28 +278,29 @@ class CraigslistScraper:
         if not text:
             return False
             
-        text = text.lower()
-        for keyword in self.keywords:
-            if keyword.lower() in text:
-                return True
-        return False
+        # find_all costs the same single pass and counts every keyword in the text
+        return bool(self.keyword_matcher.find_all(text))
         
     def _check_remote_status(self, text):
         """Check if the job is remote, non-remote, or not specified."""
         if not text:
             return "Not Specified"
             
-        text = text.lower()
-        
-        for keyword in self.remote_keywords:
-            if keyword.lower() in text:
-                return "Remote"
+        if self.remote_matcher.find_all(text):
+            return "Remote"
                 
-        for keyword in self.non_remote_keywords:
-            if keyword.lower() in text:
-                return "Non-Remote"
+        if self.non_remote_matcher.find_all(text):
+            return "Non-Remote"
                 
         return "Not Specified"
+    
+    def _publish_keyword_hits(self):
+        """Copy the hits per keyword of every matcher into the status."""
+        self.status["keyword_hits"] = {
+            "keywords": self.keyword_matcher.hit_counts(),
+            "remote": self.remote_matcher.hit_counts(),
+            "non_remote": self.non_remote_matcher.hit_counts()
+        }
 
     def _notify_user_for_captcha(self):
         """Notify the user that CAPTCHA solving is needed."""
@@ -150,45 +317,96 @@ class CraigslistScraper:
         except:
             print("\a")  # Print bell character for non-Windows systems
 
+    def _probe_page(self, indicators=BLOCK_INDICATORS):
+        """
+        Return the page title, whether a CAPTCHA element is present and the first
+        of the indicators found in the page text, or None if the probe failed.
+        """
+        try:
+            return self.driver.execute_script(
+                PROBE_PAGE_SCRIPT, CAPTCHA_SELECTOR, [indicator.lower() for indicator in indicators]
+            )
+        except Exception:
+            return None
+
+    def _record_block(self, kind="block", city=None, identity=None):
+        """Count a block event against the city and identity, by default the current ones."""
+        city = city or self.current_city
+        identity = identity or self.identity
+        self.blocks.record(city, identity, kind)
+        self.status["blocks"] = self.blocks.stats()
+        self.progress.emit("block", city=city, identity=identity, kind=kind, blocks=self.blocks.total())
+        print(f"{kind.capitalize()} detected for {city or 'unknown city'} on {identity}")
+
     def _check_for_blocking(self):
         """Check if Craigslist is blocking or throttling requests."""
         try:
-            block_indicators = [
-                "IP has been automatically blocked",
-                "please solve the CAPTCHA below",
-                "your connection has been limited",
-                "detected unusual activity"
-            ]
-            
-            page_source = self.driver.page_source.lower()
-            
-            for indicator in block_indicators:
-                if indicator.lower() in page_source:
-                    if "captcha" in indicator.lower():
-                        self._captcha_detected = True
-                        # Open a visible browser if in headless mode
-                        if self.use_headless:
-                            self.driver.quit()
-                            
-                            # Create a visible browser
-                            chrome_options = Options()
-                            chrome_options.add_argument("--window-size=1920,1080")
-                            chrome_options.add_argument(f"user-agent={get_random_user_agent()}")
-                            
-                            service = Service(ChromeDriverManager().install())
-                            self.driver = webdriver.Chrome(service=service, options=chrome_options)
-                            
-                            # Return to the current page
-                            self.driver.get(self.driver.current_url)
+            probe = self._probe_page()
+            if not probe:
+                return False
+            
+            # A reCAPTCHA/hCaptcha widget blocks the page even without any telltale text
+            indicator = probe.get("indicator")
+            captcha = bool(probe.get("captcha")) or bool(indicator and "captcha" in indicator)
+            if not indicator and not captcha:
+                return False
+            
+            # Slow down requests to the blocking host
+            current_url = self.driver.current_url
+            self.rate.record_failure(current_url)
+            self._record_block("captcha" if captcha else "block")
+            
+            if self.captcha_mode == 'quarantine':
+                self._quarantine(current_url)
+                return True
+            
+            if captcha:
+                self._captcha_detected = True
+                # Open a visible browser if in headless mode
+                if self.use_headless:
+                    self.driver.quit()
                     
-                    self._notify_user_for_captcha()
-                    self._wait_for_captcha_solution()
-                    return True
+                    # Create a visible browser
+                    self.driver = create_driver(headless=False, lean=self.lean_browser)
                     
-            return False
+                    # Return to the current page
+                    self.driver.get(current_url)
+            
+            self._notify_user_for_captcha()
+            self._wait_for_captcha_solution()
+            return True
         except:
             return False
             
+    def _quarantine(self, url):
+        """
+        Take this worker's browser identity out of rotation after a block.
+        
+        The blocked browser is discarded and the blocked host cools down for
+        quarantine_seconds; the caller parks its work until then. The worker
+        itself moves on with a fresh browser to work on other hosts.
+        """
+        self._blocked = True
+        self.rate.cool_down(url, self.quarantine_seconds)
+        print(f"Quarantining {self.identity}'s browser, cooling down {url} for {self.quarantine_seconds:.0f} seconds")
+        
+        if self.driver:
+            try:
+                self.driver.quit()
+            except Exception:
+                pass
+            self.driver = None
+
+    def _park_listing(self, idx, row, reason, count=True):
+        """Park a listing for the retry pass and return None in place of its details."""
+        link = row.get('Link', '')
+        # A listing on a cooling host isn't retried before the host has cooled down
+        delay = self.rate.cool_down_remaining(link)
+        if self.listing_retries.park(link, (idx, row), reason, delay=delay, count=count):
+            print(f"Parked listing {idx} for a retry: {reason}")
+            self.progress.emit("retry", city=row.get('City'), link=row.get('Link'), reason=reason)
+        return None
+
     def _wait_for_captcha_solution(self):
         """Wait for the CAPTCHA to be solved by checking for absence of CAPTCHA elements."""
         max_wait_time = 300  # 5 minutes maximum wait time
@@ -199,18 +417,15 @@ class CraigslistScraper:
         
         while time.time() - start_time < max_wait_time:
             try:
-                # Check various CAPTCHA indicators
-                canvas_elements = self.driver.find_elements(By.TAG_NAME, "canvas")
-                captcha_inputs = self.driver.find_elements(By.XPATH, "//input[@id='g-recaptcha-response']")
-                captcha_iframes = self.driver.find_elements(By.XPATH, "//iframe[contains(@src, 'recaptcha') or contains(@src, 'captcha')]")
-                
-                page_text = self.driver.page_source.lower()
-                captcha_text_present = any(text in page_text for text in [
-                    "captcha", "robot", "human verification", "prove you're human"
-                ])
+                # Check the CAPTCHA elements and text in a single probe
+                probe = self._probe_page(CAPTCHA_TEXTS)
+                if probe is None:
+                    time.sleep(check_interval)
+                    continue
+                captcha_text_present = probe["indicator"] is not None
                 
                 # If no CAPTCHA indicators, it's solved
-                if (not canvas_elements and not captcha_inputs and not captcha_iframes and not captcha_text_present):
+                if not probe["captcha"] and not captcha_text_present:
                     print("CAPTCHA appears to be solved! Continuing...")
                     self._captcha_detected = False
                     return True
@@ -235,159 +450,261 @@ class CraigslistScraper:
         PHASE 1: Scrape job listings from Craigslist for all cities.
         """
         all_listings = []
+        self.progress.start_phase("listings", total=len(self.cities))
         
-        # Import scraping_status from app.py for updating current city
-        from app import scraping_status
+        # Split the cities over the worker pool
+        city_results = self.pool.map(lambda worker, city: (city, *worker._scrape_city(city)), self.cities)
         
-        for city in self.cities:
-            # Update current city in status
-            scraping_status["current_city"] = city
-            
-            url = self.base_url.format(city)
-            
-            if not self._load_page_with_retry(url):
-                continue
-                
-            # Check if we're being blocked
-            if self._check_for_blocking():
-                pass
-            
-            random_delay()
-            
-            # Wait for the results to load
-            try:
-                WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_element_located((By.CLASS_NAME, "result-info"))
-                )
-            except:
-                # Try alternative class name
-                try:
-                    WebDriverWait(self.driver, 10).until(
-                        EC.presence_of_element_located((By.CLASS_NAME, "cl-static-search-result"))
-                    )
-                except:
-                    pass
-            
-            # Try different selectors to get listings
-            listing_elements = []
-            selectors_to_try = [
-                "div.result-info",
-                "li.cl-static-search-result",
-                "div.cl-search-result"
-            ]
-            
-            for selector in selectors_to_try:
-                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                if elements:
-                    listing_elements = elements
-                    break
-            
-            if not listing_elements:
-                continue
+        # Retry the cities that were blocked once the rest are done
+        while len(self.city_retries):
+            parked = self.city_retries.next_batch()
+            print(f"Retrying {len(parked)} blocked cities")
+            city_results += self.pool.map(lambda worker, city: (city, *worker._scrape_city(city)), [city for city, _, _ in parked])
+        
+        for city, _, reason, attempts in self.city_retries.dead_letters():
+            print(f"Giving up on {city} for this run after {attempts} attempts: {reason}")
+            self.progress.emit("error", city=city, message=f"Gave up after {attempts} attempts: {reason}")
+        
+        # Nearby-area results put the same posting under several cities, so keep
+        # only the first occurrence of each posting ID across the whole run
+        seen_keys = set()
+        for city, city_listings, newest in city_results:
+            city_listings = [listing for listing in city_listings if listing_key(listing["Link"]) not in seen_keys]
+            seen_keys.update(listing_key(listing["Link"]) for listing in city_listings)
             
-            for element in listing_elements:
-                # Check for max_listings limit
-                if max_listings is not None and len(all_listings) >= max_listings:
-                    break
-                    
-                try:
-                    # Find title and link
-                    title_element = None
-                    title_selectors = [
-                        "a.posting-title", 
-                        "a.title", 
-                        "a.cl-app-anchor",
-                        "a[data-testid='listing-title']"
-                    ]
-                    
-                    for selector in title_selectors:
-                        try:
-                            title_element = element.find_element(By.CSS_SELECTOR, selector)
-                            if title_element:
-                                break
-                        except:
-                            continue
-                    
-                    if not title_element:
-                        continue
-                    
-                    title = title_element.text.strip()
-                    link = title_element.get_attribute("href")
-                    
-                    # Find post date
-                    date_element = None
-                    date_selectors = [
-                        "div.meta > span:first-child",
-                        "time",
-                        "span[data-testid='listing-date']",
-                        "span.date",
-                        ".meta .pl",
-                        ".result-date"
-                    ]
-                    
-                    post_date = "Unknown"
-                    for selector in date_selectors:
-                        try:
-                            date_element = element.find_element(By.CSS_SELECTOR, selector)
-                            if date_element:
-                                # Try to get date from title attribute
-                                date_value = date_element.get_attribute("title")
-                                # If title doesn't have the date, get the text content
-                                if not date_value:
-                                    date_value = date_element.text.strip()
-                                
-                                if date_value:
-                                    post_date = date_value
-                                    break
-                        except:
-                            continue
-                    
-                    # Check if date contains any text, not just whitespace
-                    if not post_date or post_date.strip() == "" or post_date == "Unknown":
-                        # Try to find a datetime attribute
-                        try:
-                            datetime_attr = element.find_element(By.CSS_SELECTOR, "[datetime]")
-                            if datetime_attr:
-                                post_date = datetime_attr.get_attribute("datetime") or "Unknown"
-                        except:
-                            pass
-                    
-                    # Ensure date is not empty
-                    if not post_date or post_date.strip() == "":
-                        post_date = "Unknown"
-                    
-                    # Check if the title contains any of our keywords
-                    if self._has_keyword(title):
-                        all_listings.append({
-                            "City": city,
-                            "Title": title,
-                            "Link": link,
-                            "Post Date": post_date,
-                            "Processed": False
-                        })
-                except Exception:
-                    pass
-                
-                random_delay(0.5, 1.5)
+            # Check for max_listings limit
+            cut = []
+            if max_listings is not None:
+                keep = max(0, max_listings - len(all_listings))
+                city_listings, cut = city_listings[:keep], city_listings[keep:]
+            all_listings.extend(city_listings)
             
-            # Random delay between cities
-            random_delay(5, 10)
+            self._raise_watermark(city, newest, cut)
         
-        # After collecting all links from all cities, save to CSV
+        # Only pass postings that weren't scraped in an earlier run to the detail phase
+        if self.skip_seen and all_listings:
+            new_listings = self.seen.filter_new(all_listings)
+            print(f"Skipping {len(all_listings) - len(new_listings)} listings scraped in earlier runs")
+            all_listings = new_listings
+        
+        # After collecting all links from all cities, store them and save to CSV
         if all_listings:
+            for listing in all_listings:
+                self.store.upsert_listing(listing)
+                
             df = pd.DataFrame(all_listings)
             save_to_csv(df, self.links_file)
             
-            # Update history file after saving all links
-            self._update_history_file()
+            # Update history after saving all links
+            self._update_history(all_listings)
             
             return df
         else:
             return pd.DataFrame()
 
+    def _watermark_scope(self):
+        """Return a short hash of the settings that decide which postings a search keeps."""
+        scope = {
+            "base_url": self.base_url,
+            "keywords": sorted({keyword.strip().lower() for keyword in self.keywords}),
+            "search_query": bool(self.search_query)
+        }
+        return hashlib.sha1(json.dumps(scope, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+    
+    def _raise_watermark(self, city, newest, cut=()):
+        """
+        Raise a city's watermark to the newest posting ID of a complete search.
+        
+        Listings cut off by max_listings were never kept, so the watermark stays
+        below them and the next incremental run still reaches them.
+        """
+        if not newest:
+            return
+        cut_ids = [posting_id for posting_id in (_posting_number(listing["Link"]) for listing in cut) if posting_id]
+        if cut_ids:
+            newest = min(newest, min(cut_ids) - 1)
+        
+        watermark = self.store.get_watermark(city, self.watermark_scope)
+        if not watermark or newest > watermark:
+            self.store.set_watermark(city, newest, self.watermark_scope)
+    
+    def _scrape_city(self, city):
+        """
+        Scrape the search pages of a single city.
+        
+        Returns the matching listings and the newest posting ID seen, which the
+        caller turns into the city's watermark; the ID is None when the search
+        was blocked or a page failed to load.
+        
+        Result pages are walked newest first. The highest posting ID seen is kept
+        as the city's watermark for this keyword set; incremental runs with the
+        same keywords stop paging once a page or a long run of results is at or
+        below it.
+        In search_query mode one search runs per keyword OR-group and the results
+        are merged by posting ID.
+        """
+        # Update current city in status
+        self.status["current_city"] = city
+        self.current_city = city
+        self._blocked = False
+        self._search_failed = False
+        
+        watermark = self.store.get_watermark(city, self.watermark_scope)
+        newest = watermark
+        listings = []
+        seen_keys = set()
+        
+        queries = build_query_groups(self.keywords) if self.search_query else [None]
+        for query in queries:
+            query_listings, query_newest = self._scrape_search(city, query, watermark)
+            
+            if query_newest:
+                newest = max(newest or 0, query_newest)
+            
+            # The same posting can match several query groups
+            for listing in query_listings:
+                key = listing_key(listing["Link"])
+                if key not in seen_keys:
+                    seen_keys.add(key)
+                    listings.append(listing)
+            
+            if self._blocked or self._search_failed:
+                break
+        
+        # A blocked or failed search is incomplete, so it must not move the watermark
+        if self._blocked or self._search_failed:
+            reason = "blocked while searching" if self._blocked else "search page failed to load"
+            print(f"Search for {city} is incomplete ({reason}), parking city for a retry")
+            delay = self.rate.cool_down_remaining(build_search_url(self.base_url, city))
+            if self.city_retries.park(city, city, reason, delay=delay):
+                self.progress.emit("retry", city=city, reason=reason)
+            return listings, None
+        
+        self._publish_keyword_hits()
+        self.progress.advance("city_done", city=city, listings=len(listings))
+        return listings, newest
+
+    def _scrape_search(self, city, query, watermark):
+        """Walk the result pages of one search and return its listings and newest posting ID."""
+        newest = None
+        seen_ids = set()
+        listings = []
+        offset = 0
+        old_run = 0
+        
+        # srchType=T limits the query to titles, like the client-side keyword filter
+        params = {'sort': 'date'}
+        if query:
+            params.update({'query': query, 'srchType': 'T'})
+        
+        for _ in range(self.max_pages):
+            url = build_search_url(self.base_url, city, offset=offset, **params)
+            
+            if self.engine == 'browser':
+                records = self._fetch_results_browser(url)
+            else:
+                records = self._fetch_results_http(city, url)
+            
+            # A page that failed to load is not the end of the results
+            if records is None:
+                self._search_failed = True
+                break
+            
+            page_ids = {record_id for record_id in (_posting_number(record["Link"]) for record in records) if record_id}
+            new_ids = page_ids - seen_ids
+            
+            # An empty page, or one that repeats the previous page, is the last page
+            if self._blocked or not records or (page_ids and not new_ids):
+                break
+            seen_ids |= page_ids
+            page_size = len(records)
+            
+            if page_ids:
+                newest = max(newest or 0, max(page_ids))
+            
+            # Drop postings at or below the watermark when running incrementally. Renewed
+            # postings are sorted to the top with their old ID, so paging only stops
+            # at a whole page or a long run of old postings
+            reached_watermark = False
+            if self.incremental and watermark:
+                kept = []
+                for record in records:
+                    record_id = _posting_number(record["Link"])
+                    if record_id and record_id <= watermark:
+                        old_run += 1
+                    else:
+                        old_run = 0
+                        kept.append(record)
+                    if old_run >= self.watermark_stop_run:
+                        reached_watermark = True
+                reached_watermark = reached_watermark or not kept
+                records = kept
+            
+            listings.extend(self._listings_from_records(city, records))
+            
+            if reached_watermark:
+                break
+            offset += page_size
+        
+        return listings, newest
+
+    def _fetch_results_browser(self, url):
+        """Load a search page in Chrome and return its parsed results, or None if it failed to load."""
+        self._ensure_driver()
+        
+        # Returns as soon as any of the result containers is present
+        if not self._load_page_with_retry(url, wait_for=SEARCH_RESULTS_SELECTOR):
+            print(f"Failed to load search page {url}")
+            return None
+            
+        # A blocked worker gives up the page; the city is retried later
+        if self._check_for_blocking() and self._blocked:
+            return []
+        
+        # Take a single DOM snapshot and parse it locally instead of querying
+        # every result element through the WebDriver
+        return parse_search_results(self.driver.page_source, base_url=url)
+
+    def _fetch_results_http(self, city, url):
+        """Fetch a search page over HTTP and return its parsed results, or None if it failed to load."""
+        self.rate.acquire(url)
+        status_code, page_source = self.http.fetch(url)
+        if page_source is None and status_code not in BLOCK_STATUS_CODES:
+            self.rate.record_failure(url)
+            print(f"Failed to fetch search page {url} (status {status_code})")
+            return None
+            
+        # Craigslist blocks plain HTTP clients with 403s and throttles them with 429s
+        if status_code in BLOCK_STATUS_CODES or is_blocked_page(page_source):
+            self.rate.record_failure(url)
+            self.rate.cool_down(url, self.quarantine_seconds)
+            self._record_block("block", city=city, identity="http")
+            print(f"Blocked while fetching search page for {city}, parking city for a retry")
+            self._blocked = True
+            return []
+        
+        self.rate.record_success(url)
+        return parse_search_results(page_source, base_url=url)
+
+    def _listings_from_records(self, city, records):
+        """Keep the search results whose title matches a keyword."""
+        listings = []
+        for record in records:
+            # Check if the title contains any of our keywords
+            if self._has_keyword(record["Title"]):
+                listings.append({
+                    "City": city,
+                    "Title": record["Title"],
+                    "Link": record["Link"],
+                    "Post Date": record["Post Date"],
+                    "Processed": False
+                })
+        
+        return listings
+
     def clean_listings(self, df=None):
         """
-        PHASE 2 - STEP 1: Remove duplicate listings with the same title.
+        PHASE 2 - STEP 1: Remove duplicate listings with the same posting ID or title.
         """
         if df is None:
             df = load_from_csv(self.links_file)
@@ -402,20 +719,91 @@ class CraigslistScraper:
             title = re.sub(r'\s+', ' ', title)           # Remove extra spaces
             return title.lower().strip()                 # Lowercase
         
-        # Add normalized title for comparison
+        # Add the canonical posting key and normalized title for comparison
+        df['PostingKey'] = df['Link'].apply(listing_key)
         df['NormalizedTitle'] = df['Title'].apply(normalize_title)
         
-        # Remove duplicates based on normalized title
+        # Remove duplicates based on posting ID first, then on normalized title
+        before = len(df)
+        df = df.drop_duplicates(subset=['PostingKey'])
+        print(f"Removed {before - len(df)} duplicate postings by posting ID")
         df = df.drop_duplicates(subset=['NormalizedTitle'])
         
-        # Drop the temporary column
-        df = df.drop(columns=['NormalizedTitle'])
+        # Drop the temporary columns
+        df = df.drop(columns=['PostingKey', 'NormalizedTitle'])
+        
+        # Remove titles that are near-duplicates of each other or of earlier runs
+        if self.near_dup_threshold > 0:
+            df = self._drop_near_duplicate_titles(df)
         
         # Save the cleaned DataFrame
         save_to_csv(df, self.links_file)
         
         return df
         
+    def _drop_near_duplicate_titles(self, df):
+        """Drop listings whose title is a near-duplicate of an earlier or already scraped one."""
+        index = MinHashLSH(threshold=self.near_dup_threshold)
+        titles = {}
+        
+        # Start a fresh duplicate clusters report for this run
+        if os.path.exists(self.duplicate_clusters_file):
+            os.remove(self.duplicate_clusters_file)
+        
+        # Seed the index with the titles of listings scraped in earlier runs
+        current_links = set(df['Link'])
+        for row in self.store.recent_titles(self.near_dup_history):
+            if row['link'] not in current_links:
+                index.add(row['link'], row['title'])
+                titles[row['link']] = row['title']
+        
+        keep = []
+        for link, title in zip(df['Link'], df['Title']):
+            titles[link] = title
+            keep.append(not index.add(link, title))
+        
+        df = df[keep]
+        print(f"Removed {len(keep) - len(df)} near-duplicate titles")
+        
+        # Clusters made only of earlier runs' titles were already reported by those runs
+        clusters = [links for links in index.clusters() if current_links.intersection(links)]
+        self._save_duplicate_clusters('Title', clusters, titles)
+        return df
+
+    def _report_near_duplicate_descriptions(self, results):
+        """Report clusters of near-duplicate descriptions among the scraped results."""
+        index = MinHashLSH(threshold=self.near_dup_threshold, shingle_size=5)
+        descriptions = {}
+        
+        for listing in results:
+            description = listing.get('Description')
+            if not isinstance(description, str) or description in ("", "Description Not Found") or description.startswith("Error:"):
+                continue
+            descriptions[listing.get('Link')] = description
+            index.add(listing.get('Link'), description)
+        
+        self._save_duplicate_clusters('Description', index.clusters(), descriptions)
+
+    def _save_duplicate_clusters(self, field, clusters, texts):
+        """Append near-duplicate clusters to the duplicate clusters report."""
+        if not clusters:
+            return
+        
+        rows = []
+        for cluster_id, links in enumerate(clusters, start=1):
+            for link in links:
+                rows.append({
+                    "Field": field,
+                    "Cluster": cluster_id,
+                    "Link": link,
+                    "Text": str(texts.get(link, ""))[:200]
+                })
+        
+        # Description clusters are added to the title clusters of the same run
+        existing = load_from_csv(self.duplicate_clusters_file) if os.path.exists(self.duplicate_clusters_file) else pd.DataFrame()
+        save_to_csv(pd.concat([existing, pd.DataFrame(rows)], ignore_index=True), self.duplicate_clusters_file)
+        print(f"Found {len(clusters)} clusters of near-duplicate {field.lower()}s")
+
     def _replace_empty_with_null(self, df):
         """Replace empty values with 'null' in rows that have at least some data."""
         df_copy = df.copy()
@@ -431,16 +819,19 @@ class CraigslistScraper:
         
         return df_copy
 
-    def scrape_details(self, df=None, start_index=0, max_listings=None):
+    def scrape_details(self, df=None, start_index=0, max_listings=None, resume=False):
         """
         PHASE 2 - STEP 2: Visit each listing and extract email, description, and remote status.
+        
+        With resume=True the results already checkpointed in the output file are
+        kept and their links are skipped.
         """
         if df is None:
             df = load_from_csv(self.links_file)
             
         if df.empty:
             return pd.DataFrame()
-            
+        
         results = []
         
         # Handle start_index and max_listings
@@ -453,315 +844,410 @@ class CraigslistScraper:
         
         if max_listings is not None:
             filtered_df = filtered_df.iloc[:max_listings]
-            
-        # Import scraping_status from app.py for updating current city
-        from app import scraping_status
         
         # Add already processed listings to results
-        if start_index > 0:
+        processed_links = set()
+        if start_index > 0 or resume:
             already_processed_df = load_from_csv(self.output_file)
             if not already_processed_df.empty:
                 results.extend(already_processed_df.to_dict('records'))
+                if 'Link' in already_processed_df.columns:
+                    processed_links = set(already_processed_df['Link'].dropna())
+            
+            if resume:
+                print(f"Resuming with {len(processed_links)} listings already processed")
         
-        # Process each listing
+        # Collect the listings that still need to be processed
+        pending = []
         for idx, row in filtered_df.iterrows():
-            if max_listings is not None and len(results) >= max_listings:
+            if max_listings is not None and len(results) + len(pending) >= max_listings:
                 break
             
             # Check if this row has been processed already
             if 'Processed' in row and row['Processed']:
                 continue
-
-            # Update status with current city
-            city = row.get('City', 'Unknown')
-            scraping_status["current_city"] = city
-                
-            link = row.get('Link', '')
-            if not link:
+            if row.get('Link') in processed_links:
                 continue
             
+            pending.append((idx, row))
+        
+        results_lock = threading.Lock()
+        self.progress.start_phase("details", total=len(pending))
+        
+        # Append each finished listing to the output file instead of rewriting it;
+        # a resumed run keeps the rows that are already there
+        writer = CheckpointWriter(
+            self.output_file,
+            [column for column, _ in DETAIL_COLUMNS],
+            fsync_interval=self.fsync_interval,
+            append=start_index > 0 or resume
+        )
+        
+        def record(listing_data):
+            if listing_data is None:
+                return
+            
+            self.store.upsert_detail(listing_data)
+            self.seen.add(listing_data.get('Link'))
+            writer.write(listing_data)
+            
+            with results_lock:
+                results.append(listing_data)
+            
+            self.progress.advance(
+                "detail_done",
+                city=listing_data.get('City'),
+                link=listing_data.get('Link'),
+                email_found=listing_data.get('Email') not in (None, "", "Not Available")
+            )
+        
+        try:
+            if self.tabs > 1:
+                # Give each worker an equal share of listings to load in its tabs
+                chunks = [pending[i::self.workers] for i in range(self.workers)]
+                self.pool.map(lambda worker, chunk: worker._scrape_listings_in_tabs(chunk, record), chunks)
+            else:
+                # Split the listings over the worker pool
+                self.pool.map(lambda worker, item: record(worker._scrape_listing(*item)), pending)
+            
+            # Retry the parked listings now that the main pass is done, so they don't hold it up
+            while len(self.listing_retries):
+                parked = self.listing_retries.next_batch()
+                print(f"Retrying {len(parked)} parked listings")
+                self.pool.map(lambda worker, item: record(worker._scrape_listing(*item)), [item for _, item, _ in parked])
+            
+            # Keep the listings that failed every attempt for inspection instead of dropping them
+            dead_letters = self.listing_retries.dead_letters()
+            for _, (idx, row), reason, attempts in dead_letters:
+                self.store.add_dead_letter(row, reason, attempts)
+                self.progress.emit("error", city=row.get('City'), link=row.get('Link'), message=f"Gave up after {attempts} attempts: {reason}")
+            if dead_letters:
+                print(f"{len(dead_letters)} listings failed every retry and were moved to the dead letters")
+        finally:
+            writer.close()
+        
+        print(f"Final results saved to {self.output_file}")
+        
+        # Report cross-posted gigs whose descriptions are near-duplicates
+        if self.near_dup_threshold > 0:
+            self._report_near_duplicate_descriptions(results)
+        
+        return pd.DataFrame(results)
+        
+    def _scrape_listings_in_tabs(self, items, on_result):
+        """
+        Scrape listings with several tabs of one browser.
+        
+        Up to self.tabs listing pages load in background tabs while the
+        reply/email flow runs in the foreground tab, one tab at a time.
+        """
+        driver = self._ensure_driver()
+        main_handle = driver.current_window_handle
+        queue = deque(items)
+        open_tabs = deque()
+        
+        while queue or open_tabs:
+            # The CAPTCHA flow may have replaced the browser, along with its tabs
+            if self._ensure_driver() is not driver:
+                driver = self.driver
+                main_handle = driver.current_window_handle
+                open_tabs = deque((None, idx, row) for _, idx, row in open_tabs)
+            
+            # Keep the tabs filled with pages that are loading
+            while queue and len(open_tabs) < self.tabs:
+                idx, row = queue.popleft()
+                if self.rate.cool_down_remaining(row.get('Link', '')) > 0:
+                    on_result(self._park_listing(idx, row, "host cooling down", count=False))
+                    continue
+                try:
+                    self.rate.acquire(row.get('Link', ''))
+                    driver.switch_to.new_window('tab')
+                    if self.lean_browser:
+                        # Blocked URLs are set per tab
+                        apply_resource_blocking(driver)
+                    # Assigning location returns immediately, unlike driver.get
+                    driver.execute_script("window.location.href = arguments[0];", row.get('Link', ''))
+                    open_tabs.append((driver.current_window_handle, idx, row))
+                except Exception as e:
+                    print(f"Error opening tab for listing {idx}: {str(e)}")
+                    open_tabs.append((None, idx, row))
+                finally:
+                    # New tabs are always opened from the main tab, which is never closed
+                    main_handle = self._switch_to_main_tab(driver, main_handle)
+            
+            handle, idx, row = open_tabs.popleft()
+            preloaded = False
             try:
-                # Visit the listing page
-                if not self._load_page_with_retry(link):
-                    if attempt == self.max_retries - 1:
-                        listing_data = row.to_dict()
-                        listing_data['Description'] = "Error: Failed to load page"
-                        listing_data['Remote'] = "Not Specified"
-                        listing_data['Email'] = "Not Available"
-                        listing_data['Default Mail'] = ""
-                        listing_data['Gmail'] = ""
-                        listing_data['Yahoo'] = ""
-                        listing_data['Outlook'] = ""
-                        listing_data['AOL'] = ""
-                        listing_data['Processed'] = True
-                        results.append(listing_data)
-                        continue
-                    
-                # Check if we're being blocked
-                if self._check_for_blocking():
+                if handle:
+                    driver.switch_to.window(handle)
+                    preloaded = True
+            except Exception:
+                # The tab is gone, load the listing in the main tab instead
+                main_handle = self._switch_to_main_tab(driver, main_handle)
+            
+            on_result(self._scrape_listing(idx, row, preloaded=preloaded))
+            
+            # A CAPTCHA during the listing may have replaced the browser
+            if self.driver is not driver:
+                continue
+            if preloaded:
+                try:
+                    driver.close()
+                except Exception:
                     pass
+            # Never leave the driver focused on the closed tab
+            main_handle = self._switch_to_main_tab(driver, main_handle)
+    
+    @staticmethod
+    def _switch_to_main_tab(driver, main_handle):
+        """Focus the main tab, falling back to the first open one, and return its handle."""
+        try:
+            driver.switch_to.window(main_handle)
+            return main_handle
+        except Exception:
+            handle = driver.window_handles[0]
+            driver.switch_to.window(handle)
+            return handle
+
+    def _wait_for_page_ready(self, timeout=10):
+        """Wait for a listing that is already loading in the current tab to become usable."""
+        try:
+            WebDriverWait(self.driver, timeout).until(lambda driver: driver.current_url != "about:blank")
+            return self._wait_until_usable(POSTING_BODY_SELECTOR, timeout)
+        except Exception:
+            return False
+
+    def _wait_for_element(self, selector, timeout=30, block_selector=CAPTCHA_SELECTOR):
+        """
+        Wait inside the page for an element to appear and return "found", "blocked" or None.
+        
+        "blocked" means a CAPTCHA appeared before the element; None means neither
+        appeared within the timeout or the page navigated away.
+        """
+        try:
+            self.driver.set_script_timeout(timeout + 5)
+            return self.driver.execute_async_script(
+                WAIT_FOR_ELEMENT_SCRIPT, selector, block_selector or "", int(timeout * 1000)
+            )
+        except Exception:
+            return None
+
+    def _scrape_listing(self, idx, row, preloaded=False):
+        """
+        Visit a single listing and return its details, or None if it was skipped.
+        
+        When preloaded is True the listing is already loading in the current tab.
+        """
+        link = row.get('Link', '')
+        if not link:
+            return None
+        
+        # Don't wait out a blocked host; come back to it once it has cooled down
+        if self.rate.cool_down_remaining(link) > 0:
+            return self._park_listing(idx, row, "host cooling down", count=False)
+        
+        # Each worker needs its own browser for the reply/email flow
+        self._ensure_driver()
+        
+        # Update status with current city
+        city = row.get('City', 'Unknown')
+        self.status["current_city"] = city
+        self.current_city = city
+        self._blocked = False
+        
+        try:
+            # Visit the listing page, unless it is already loading in this tab
+            loaded = preloaded and self._wait_for_page_ready()
+            if loaded:
+                self.rate.record_success(link)
+            if not loaded and not self._load_page_with_retry(link, wait_for=POSTING_BODY_SELECTOR):
+                return self._park_listing(idx, row, "failed to load page")
                 
-                random_delay()
+            # Check if we're being blocked
+            if self._check_for_blocking() and self._blocked:
+                return self._park_listing(idx, row, "blocked on the listing page")
+            
+            # Extract the description
+            try:
+                description_element = resolver.find(self.driver, 'description', DESCRIPTION_SELECTORS, timeout=10)
                 
-                # Extract the description
-                try:
-                    description_element = None
-                    desc_selectors = ["#postingbody", "section#postingbody", "div[data-testid='postingbody']"]
-                    
-                    for selector in desc_selectors:
-                        try:
-                            description_element = WebDriverWait(self.driver, 10).until(
-                                EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                            )
-                            if description_element:
-                                break
-                        except:
-                            continue
+                if description_element:
+                    description = description_element.text.strip()
+                    listing_data = row.to_dict()
+                    listing_data['Description'] = description
                     
-                    if description_element:
-                        description = description_element.text.strip()
-                        listing_data = row.to_dict()
-                        listing_data['Description'] = description
-                        
-                        # Determine if the job is remote
-                        remote_status = self._check_remote_status(description)
-                        listing_data['Remote'] = remote_status
-                    else:
-                        listing_data = row.to_dict()
-                        listing_data['Description'] = "Description Not Found"
-                        listing_data['Remote'] = "Not Specified"
-                except Exception:
+                    # Determine if the job is remote
+                    remote_status = self._check_remote_status(description)
+                    listing_data['Remote'] = remote_status
+                    self._publish_keyword_hits()
+                else:
                     listing_data = row.to_dict()
-                    listing_data['Description'] = ""
+                    listing_data['Description'] = "Description Not Found"
                     listing_data['Remote'] = "Not Specified"
+            except Exception:
+                listing_data = row.to_dict()
+                listing_data['Description'] = ""
+                listing_data['Remote'] = "Not Specified"
+            
+            # Initialize email fields
+            listing_data['Email'] = "Not Available"
+            listing_data['Default Mail'] = ""
+            listing_data['Gmail'] = ""
+            listing_data['Yahoo'] = ""
+            listing_data['Outlook'] = ""
+            listing_data['AOL'] = ""
+            
+            # Try to get email information
+            try:
+                # Find and click the reply button
+                reply_button = resolver.find(self.driver, 'reply_button', REPLY_SELECTORS, timeout=5, clickable=True)
                 
-                # Initialize email fields
-                listing_data['Email'] = "Not Available"
-                listing_data['Default Mail'] = ""
-                listing_data['Gmail'] = ""
-                listing_data['Yahoo'] = ""
-                listing_data['Outlook'] = ""
-                listing_data['AOL'] = ""
-                
-                # Try to get email information
-                try:
-                    # Find and click the reply button
-                    reply_button = None
-                    reply_selectors = [
-                        "button.reply-button",
-                        "button[data-href*='/reply/']",
-                        "a.reply-button",
-                        "a[href*='/reply/']"
-                    ]
+                if reply_button:
+                    # Clicking reply fetches the contact info from the listing's host
+                    self.rate.acquire(link)
+                    reply_button.click()
                     
-                    for selector in reply_selectors:
-                        try:
-                            reply_button = WebDriverWait(self.driver, 5).until(
-                                EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
-                            )
-                            if reply_button:
-                                break
-                        except:
-                            continue
+                    # Returns the moment the reply panel renders its email option, for up to 30 seconds
+                    email_button_selector = ", ".join(EMAIL_BUTTON_SELECTORS)
+                    outcome = self._wait_for_element(email_button_selector, timeout=30)
                     
-                    if reply_button:
-                        reply_button.click()
-                        
-                        # Check for CAPTCHA after clicking reply
+                    if outcome == "blocked":
                         if self._check_for_blocking():
+                            if self._blocked:
+                                return self._park_listing(idx, row, "blocked after clicking reply")
+                            
                             # After CAPTCHA is solved, reload and try again
-                            self._load_page_with_retry(link)
+                            self._load_page_with_retry(link, wait_for=POSTING_BODY_SELECTOR)
                             
                             # Try to find reply button again
-                            for selector in reply_selectors:
-                                try:
-                                    reply_button = WebDriverWait(self.driver, 5).until(
-                                        EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
-                                    )
-                                    if reply_button:
-                                        reply_button.click()
-                                        break
-                                except:
-                                    continue
-                        
-                        # Wait for email button
-                        email_found = False
-                        email_button_selectors = [
-                            "button.reply-option-header",
-                            "button[class*='reply-email']",
-                            "div[class*='reply-email']"
-                        ]
+                            reply_button = resolver.find(self.driver, 'reply_button', REPLY_SELECTORS, timeout=5, clickable=True)
+                            if reply_button:
+                                self.rate.acquire(link)
+                                reply_button.click()
                         
-                        # Check periodically for 30 seconds
-                        for _ in range(15):  # 15 iterations × 2 seconds = 30 seconds
-                            for selector in email_button_selectors:
-                                try:
-                                    email_button = WebDriverWait(self.driver, 2).until(
-                                        EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
-                                    )
-                                    email_button.click()
-                                    email_found = True
-                                    break
-                                except:
-                                    continue
-                                
-                            if email_found:
-                                break
-                                
-                            time.sleep(2)
+                        # Keep waiting for the email option once the CAPTCHA is out of the way
+                        outcome = self._wait_for_element(email_button_selector, timeout=30, block_selector=None)
+                    
+                    # Click the email button
+                    email_found = False
+                    email_button = resolver.find(
+                        self.driver, 'email_button', EMAIL_BUTTON_SELECTORS,
+                        timeout=2 if outcome == "found" else 0, clickable=True
+                    )
+                    if email_button:
+                        try:
+                            email_button.click()
+                            email_found = True
+                        except Exception:
+                            pass
+                    
+                    if email_found:
+                        # Get email information
+                        try:
+                            # The address is rendered as soon as the reply info request returns
+                            self._wait_for_element(", ".join(EMAIL_SELECTORS), timeout=10, block_selector=None)
+                            email_container = resolver.find(self.driver, 'email_container', EMAIL_CONTAINER_SELECTORS, timeout=2)
                             
-                            # Check for CAPTCHA while waiting
-                            if self._check_for_blocking():
-                                pass
-                        
-                        if email_found:
-                            # Get email information
-                            try:
-                                email_container = None
-                                container_selectors = [
-                                    "div.reply-content-email",
-                                    "div[class*='reply-email']",
-                                    "div.reply-info"
-                                ]
-                                
-                                for selector in container_selectors:
-                                    try:
-                                        email_container = WebDriverWait(self.driver, 10).until(
-                                            EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                                        )
-                                        if email_container:
-                                            break
-                                    except:
-                                        continue
+                            if email_container:
+                                # Extract email address
+                                email_element = resolver.find(self.driver, 'email_address', EMAIL_SELECTORS, timeout=0, root=email_container)
                                 
-                                if email_container:
-                                    # Extract email address
-                                    email_element = None
-                                    email_selectors = [
-                                        "div.reply-email-address a",
-                                        "a[href^='mailto:']",
-                                        "a[class*='email']"
-                                    ]
+                                if email_element:
+                                    # Get email text
+                                    email = email_element.text.strip()
                                     
-                                    for selector in email_selectors:
-                                        try:
-                                            email_element = email_container.find_element(By.CSS_SELECTOR, selector)
-                                            if email_element:
-                                                break
-                                        except:
-                                            continue
-                                        
-                                    if email_element:
-                                        # Get email text
-                                        email = email_element.text.strip()
-                                        
-                                        # If text is empty, extract from href
-                                        if not email or '@' not in email:
-                                            href = email_element.get_attribute("href")
-                                            if href and href.startswith("mailto:"):
-                                                email = href.replace("mailto:", "").split("?")[0]
-                                        
-                                        listing_data['Email'] = email
-                                        
-                                        # Store complete mailto URL
+                                    # If text is empty, extract from href
+                                    if not email or '@' not in email:
                                         href = email_element.get_attribute("href")
                                         if href and href.startswith("mailto:"):
-                                            listing_data['Default Mail'] = href
-                                            
-                                            # For Email field, extract just the address
-                                            email_part = href.replace("mailto:", "").split("?")[0]
-                                            if not listing_data['Email'] or '@' not in listing_data['Email']:
-                                                listing_data['Email'] = email_part
+                                            email = href.replace("mailto:", "").split("?")[0]
                                     
-                                    # Extract webmail links
-                                    webmail_links = email_container.find_elements(By.CSS_SELECTOR, "a[class*='webmail']")
+                                    listing_data['Email'] = email
                                     
-                                    for link in webmail_links:
-                                        href = link.get_attribute("href")
-                                        if href:
-                                            class_attr = link.get_attribute("class")
-                                            if class_attr:
-                                                if "gmail" in class_attr:
-                                                    listing_data['Gmail'] = href
-                                                elif "yahoo" in class_attr:
-                                                    listing_data['Yahoo'] = href
-                                                elif "outlook" in class_attr:
-                                                    listing_data['Outlook'] = href
-                                                elif "aol" in class_attr:
-                                                    listing_data['AOL'] = href
-                            except Exception:
-                                pass
-                except Exception:
-                    pass
-                
-                # Mark as processed and break the retry loop
-                listing_data['Processed'] = True
-                results.append(listing_data)
-                
-                # Save progress after each batch
-                if len(results) % self.batch_size == 0:
-                    progress_df = pd.DataFrame(results)
-                    save_to_csv(progress_df, self.output_file)
-                    print(f"Saved {len(results)} results to {self.output_file}")
-                
-            except Exception as e:
-                print(f"Error processing listing {idx}: {str(e)}")
-                continue
-        
-        # Save final results
-        final_df = pd.DataFrame(results)
-        save_to_csv(final_df, self.output_file)
-        print(f"Final results saved to {self.output_file}")
-        
-        return final_df
-        
+                                    # Store complete mailto URL
+                                    href = email_element.get_attribute("href")
+                                    if href and href.startswith("mailto:"):
+                                        listing_data['Default Mail'] = href
+                                        
+                                        # For Email field, extract just the address
+                                        email_part = href.replace("mailto:", "").split("?")[0]
+                                        if not listing_data['Email'] or '@' not in listing_data['Email']:
+                                            listing_data['Email'] = email_part
+                                
+                                # Extract webmail links
+                                webmail_links = email_container.find_elements(By.CSS_SELECTOR, "a[class*='webmail']")
+                                
+                                for link in webmail_links:
+                                    href = link.get_attribute("href")
+                                    if href:
+                                        class_attr = link.get_attribute("class")
+                                        if class_attr:
+                                            if "gmail" in class_attr:
+                                                listing_data['Gmail'] = href
+                                            elif "yahoo" in class_attr:
+                                                listing_data['Yahoo'] = href
+                                            elif "outlook" in class_attr:
+                                                listing_data['Outlook'] = href
+                                            elif "aol" in class_attr:
+                                                listing_data['AOL'] = href
+                        except Exception:
+                            pass
+            except Exception:
+                pass
+            
+            # Mark as processed and break the retry loop
+            listing_data['Processed'] = True
+            return listing_data
+            
+        except Exception as e:
+            print(f"Error processing listing {idx}: {str(e)}")
+            return self._park_listing(idx, row, f"error: {str(e)}")
+
+    def driver_pids(self):
+        """Return the ChromeDriver process IDs of this scraper's and its workers' browsers."""
+        if hasattr(self, 'pool') and self.pool:
+            return self.pool.driver_pids()
+        try:
+            return {self.driver.service.process.pid} if self.driver else set()
+        except Exception:
+            return set()
+
     def close(self):
         """Close the browser."""
+        # Close the browsers of the extra workers first
+        if hasattr(self, 'pool') and self.pool:
+            self.pool.close()
+            
         if hasattr(self, 'driver') and self.driver:
             try:
                 self.driver.quit()
             except Exception as e:
                 print(f"Error closing browser: {str(e)}")
+        
+        if self.http:
+            self.http.close()
+        
+        if hasattr(self, 'store') and self.store:
+            self.store.close()
                 
         # Reset CAPTCHA flag
         self._captcha_detected = False 
 
-    def _update_history_file(self):
-        """Update the history file with new links from the current scraping run"""
+    def _update_history(self, listings=None):
+        """Add the links of the current scraping run to the history store"""
         try:
-            # Read existing links from history file
-            existing_links = set()
-            if os.path.exists(self.history_links_file):
-                with open(self.history_links_file, 'r', encoding='utf-8') as f:
-                    # Skip header
-                    next(f)
-                    for line in f:
-                        link = line.split(',')[0].strip()
-                        existing_links.add(link)
-
-            # Read new links from current scraping run
-            new_links = []
-            if os.path.exists(self.links_file):
-                with open(self.links_file, 'r', encoding='utf-8') as f:
-                    # Skip header
-                    next(f)
-                    for line in f:
-                        parts = line.strip().split(',')
-                        if len(parts) >= 3:
-                            link, city, title = parts[0], parts[1], parts[2]
-                            if link not in existing_links:
-                                new_links.append(f"{link},{city},{title},{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-
-            # Append new links to history file
-            if new_links:
-                with open(self.history_links_file, 'a', encoding='utf-8') as f:
-                    f.writelines(new_links)
-                print(f"Added {len(new_links)} new links to history file")
-
+            if listings is None:
+                df = load_from_csv(self.links_file)
+                listings = df.to_dict('records') if not df.empty else []
+            
+            added = sum(1 for listing in listings if self.store.add_history(listing))
+            if added:
+                print(f"Added {added} new links to history")
+                
         except Exception as e:
-            print(f"Error updating history file: {str(e)}")
+            print(f"Error updating history: {str(e)}")
 
     def cleanup(self):
-        """Cleanup method that also updates the history file"""
-        self._update_history_file()
-        # Add any other cleanup code here 
\ No newline at end of file
+        """Cleanup method that also updates the history"""
+        self._update_history()
+        # Add any other cleanup code here 
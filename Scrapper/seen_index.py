@@ -0,0 +1,33 @@
+import threading
+from utils import extract_posting_id
+
+def listing_key(link):
+    """Return the canonical key of a listing: its posting ID, or the link if it has none."""
+    return extract_posting_id(link) or link
+
+class SeenIndex:
+    """
+    Set of postings whose details were already scraped, across runs.
+
+    The set lives in memory for constant-time lookups and is loaded from the
+    listing store's details table, which is also where new entries persist.
+    """
+
+    def __init__(self, store):
+        self._lock = threading.Lock()
+        self._keys = set(store.processed_keys())
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, link):
+        return listing_key(link) in self._keys
+
+    def add(self, link):
+        """Mark a listing as seen."""
+        with self._lock:
+            self._keys.add(listing_key(link))
+
+    def filter_new(self, listings):
+        """Return only the listings that haven't been seen before."""
+        return [listing for listing in listings if listing.get('Link') not in self]
@@ -0,0 +1,84 @@
+import threading
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+
+class SelectorResolver:
+    """
+    Find an element through a list of CSS selector variants with a single wait.
+
+    Instead of waiting on each variant in turn, the resolver waits once on the
+    CSS union of all of them. It remembers which variant matched for each page
+    type and checks that one first next time. Hits per variant and misses are
+    counted per page type.
+    """
+
+    def __init__(self):
+        self._preferred = {}
+        self._hits = {}
+        self._misses = {}
+        self._lock = threading.Lock()
+
+    def _ordered(self, page_type, selectors):
+        """Return the selectors with the last variant that matched first."""
+        preferred = self._preferred.get(page_type)
+        if preferred in selectors:
+            return [preferred] + [selector for selector in selectors if selector != preferred]
+        return list(selectors)
+
+    def _match(self, root, selectors, clickable):
+        """Return (selector, element) for the first variant present under root, or None."""
+        for selector in selectors:
+            for element in root.find_elements(By.CSS_SELECTOR, selector):
+                if not clickable or (element.is_displayed() and element.is_enabled()):
+                    return selector, element
+        return None
+
+    def _record(self, page_type, selector):
+        with self._lock:
+            if selector is None:
+                self._misses[page_type] = self._misses.get(page_type, 0) + 1
+                return
+            self._preferred[page_type] = selector
+            hits = self._hits.setdefault(page_type, {})
+            hits[selector] = hits.get(selector, 0) + 1
+
+    def find(self, driver, page_type, selectors, timeout=10, clickable=False, root=None):
+        """
+        Return the first element matching any of the selectors, or None.
+
+        With a timeout of 0 the lookup is immediate. root limits the search to
+        the children of an element.
+        """
+        root = root or driver
+        ordered = self._ordered(page_type, selectors)
+        union = ", ".join(ordered)
+
+        try:
+            if timeout > 0:
+                # One round trip per poll until any variant is present
+                found = WebDriverWait(driver, timeout).until(
+                    lambda _: root.find_elements(By.CSS_SELECTOR, union) and self._match(root, ordered, clickable)
+                )
+            else:
+                found = self._match(root, ordered, clickable)
+        except Exception:
+            found = None
+
+        self._record(page_type, found[0] if found else None)
+        return found[1] if found else None
+
+    def stats(self):
+        """Return the preferred variant, hits per variant and misses of every page type."""
+        with self._lock:
+            page_types = set(self._hits) | set(self._misses)
+            return {
+                page_type: {
+                    "preferred": self._preferred.get(page_type),
+                    "hits": dict(self._hits.get(page_type, {})),
+                    "misses": self._misses.get(page_type, 0)
+                }
+                for page_type in sorted(page_types)
+            }
+
+# Process-wide resolver, so what was learned carries over between runs
+resolver = SelectorResolver()
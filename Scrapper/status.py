@@ -0,0 +1,71 @@
+import copy
+import threading
+
+DEFAULT_STATUS = {
+    "is_running": False,
+    "progress": 0,
+    "current_phase": "Not Started",
+    "last_completed": None,
+    "completed": False,
+    "error": False,
+    "no_results": False,
+    "current_city": None,
+    "blocks": {},
+    "keyword_hits": {}
+}
+
+class ScrapingStatus:
+    """
+    Thread-safe scraping status shared by the API and the scraper thread.
+
+    It reads and writes like the dict it replaces. reset() clears it in
+    place, so every module holding a reference keeps seeing the live status.
+    """
+
+    def __init__(self, defaults=None):
+        self._defaults = copy.deepcopy(defaults or DEFAULT_STATUS)
+        self._data = copy.deepcopy(self._defaults)
+        self._lock = threading.RLock()
+
+    def __getitem__(self, key):
+        with self._lock:
+            return self._data[key]
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._data[key] = value
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data
+
+    def get(self, key, default=None):
+        with self._lock:
+            return self._data.get(key, default)
+
+    def update(self, values=None, **kwargs):
+        """Update several fields at once, so readers never see a half-applied change."""
+        with self._lock:
+            self._data.update(values or {}, **kwargs)
+
+    def reset(self):
+        """Restore the default values in place."""
+        with self._lock:
+            self._data.clear()
+            self._data.update(copy.deepcopy(self._defaults))
+
+    def try_start(self):
+        """Mark a run as started, or return False if one is already running."""
+        with self._lock:
+            if self._data["is_running"]:
+                return False
+            self._data["is_running"] = True
+            return True
+
+    def snapshot(self):
+        """Return a consistent copy of the status."""
+        with self._lock:
+            return copy.deepcopy(self._data)
+
+# Process-wide status of the scrape started through the API
+scraping_status = ScrapingStatus()
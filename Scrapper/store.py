@@ -0,0 +1,389 @@
+import os
+import csv
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from utils import extract_posting_id
+
+# Columns of the per-listing details, as (CSV column, table column)
+DETAIL_COLUMNS = [
+    ("City", "city"),
+    ("Title", "title"),
+    ("Link", "link"),
+    ("Post Date", "post_date"),
+    ("Processed", "processed"),
+    ("Description", "description"),
+    ("Remote", "remote"),
+    ("Email", "email"),
+    ("Default Mail", "default_mail"),
+    ("Gmail", "gmail"),
+    ("Yahoo", "yahoo"),
+    ("Outlook", "outlook"),
+    ("AOL", "aol")
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS listings (
+    link TEXT PRIMARY KEY,
+    posting_id TEXT,
+    city TEXT,
+    title TEXT,
+    post_date TEXT,
+    processed INTEGER DEFAULT 0,
+    date_scraped TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_listings_posting_id ON listings (posting_id);
+CREATE INDEX IF NOT EXISTS idx_listings_city ON listings (city);
+CREATE INDEX IF NOT EXISTS idx_listings_date_scraped ON listings (date_scraped);
+
+CREATE TABLE IF NOT EXISTS details (
+    link TEXT PRIMARY KEY,
+    posting_id TEXT,
+    city TEXT,
+    title TEXT,
+    post_date TEXT,
+    processed INTEGER DEFAULT 1,
+    description TEXT,
+    remote TEXT,
+    email TEXT,
+    default_mail TEXT,
+    gmail TEXT,
+    yahoo TEXT,
+    outlook TEXT,
+    aol TEXT,
+    date_scraped TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_details_posting_id ON details (posting_id);
+CREATE INDEX IF NOT EXISTS idx_details_city ON details (city);
+CREATE INDEX IF NOT EXISTS idx_details_date_scraped ON details (date_scraped);
+
+CREATE TABLE IF NOT EXISTS history (
+    link TEXT PRIMARY KEY,
+    posting_id TEXT,
+    city TEXT,
+    title TEXT,
+    date_scraped TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_history_posting_id ON history (posting_id);
+CREATE INDEX IF NOT EXISTS idx_history_city ON history (city);
+CREATE INDEX IF NOT EXISTS idx_history_date_scraped ON history (date_scraped);
+
+CREATE TABLE IF NOT EXISTS search_watermarks (
+    city TEXT NOT NULL,
+    scope TEXT NOT NULL DEFAULT '',
+    posting_id INTEGER,
+    updated_at TEXT,
+    PRIMARY KEY (city, scope)
+);
+
+CREATE TABLE IF NOT EXISTS dead_letters (
+    link TEXT PRIMARY KEY,
+    posting_id TEXT,
+    city TEXT,
+    title TEXT,
+    reason TEXT,
+    attempts INTEGER,
+    failed_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_dead_letters_failed_at ON dead_letters (failed_at);
+
+CREATE TABLE IF NOT EXISTS schedules (
+    id TEXT PRIMARY KEY,
+    name TEXT,
+    cron TEXT NOT NULL,
+    config TEXT,
+    priority INTEGER DEFAULT 0,
+    enabled INTEGER DEFAULT 1,
+    last_run TEXT,
+    next_run TEXT,
+    last_job_id TEXT,
+    created_at TEXT
+);
+
+CREATE VIEW IF NOT EXISTS links_csv AS
+    SELECT city AS "City", title AS "Title", link AS "Link", post_date AS "Post Date",
+           CASE WHEN processed THEN 'True' ELSE 'False' END AS "Processed"
+    FROM listings;
+
+CREATE VIEW IF NOT EXISTS results_csv AS
+    SELECT city AS "City", title AS "Title", link AS "Link", post_date AS "Post Date",
+           CASE WHEN processed THEN 'True' ELSE 'False' END AS "Processed",
+           description AS "Description", remote AS "Remote", email AS "Email",
+           default_mail AS "Default Mail", gmail AS "Gmail", yahoo AS "Yahoo",
+           outlook AS "Outlook", aol AS "AOL"
+    FROM details;
+
+CREATE VIEW IF NOT EXISTS history_csv AS
+    SELECT link, city, title, date_scraped FROM history;
+
+CREATE VIEW IF NOT EXISTS dead_letters_csv AS
+    SELECT city AS "City", title AS "Title", link AS "Link", reason AS "Reason",
+           attempts AS "Attempts", failed_at AS "Failed At"
+    FROM dead_letters;
+"""
+
+# Schema changes that can't be written as CREATE ... IF NOT EXISTS, in order.
+# Each runs once per database; PRAGMA user_version records how many have run.
+MIGRATIONS = [
+    # Watermarks used to be per city only; they can't be attributed to a keyword set
+    "DROP TABLE IF EXISTS watermarks;"
+]
+
+def _now():
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+def _is_true(value):
+    """Interpret the Processed values found in DataFrames and CSVs."""
+    if isinstance(value, str):
+        return value.strip().lower() == 'true'
+    return bool(value) and value == value  # NaN is truthy but not processed
+
+class ListingStore:
+    """
+    Embedded SQLite store for listings, scraped details and link history.
+
+    Rows are upserted one at a time, so no file is ever rewritten as a whole.
+    The *_csv views keep the column names of the old CSV files for export.
+    """
+
+    def __init__(self, db_file=None):
+        self.db_file = db_file or os.getenv('DB_FILE', 'scraper.db')
+        directory = os.path.dirname(self.db_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # One connection shared by all worker threads, serialized by a lock
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(self.db_file, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        with self._lock:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.executescript(SCHEMA)
+            self.conn.commit()
+            self._migrate()
+
+    def _migrate(self):
+        """Run the migrations this database hasn't had yet."""
+        with self._lock:
+            version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+            for number, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+                self.conn.executescript(migration)
+                self.conn.execute(f"PRAGMA user_version = {number}")
+                self.conn.commit()
+
+    def _execute(self, sql, params=()):
+        with self._lock:
+            cursor = self.conn.execute(sql, params)
+            self.conn.commit()
+            return cursor
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return [dict(row) for row in self.conn.execute(sql, params).fetchall()]
+
+    def upsert_listing(self, listing):
+        """Insert or update a search result, keyed by its link."""
+        link = listing.get('Link')
+        if not link:
+            return
+
+        self._execute(
+            """
+            INSERT INTO listings (link, posting_id, city, title, post_date, processed, date_scraped)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(link) DO UPDATE SET
+                city = excluded.city,
+                title = excluded.title,
+                post_date = excluded.post_date,
+                processed = MAX(listings.processed, excluded.processed)
+            """,
+            (link, extract_posting_id(link), listing.get('City'), listing.get('Title'),
+             listing.get('Post Date'), int(_is_true(listing.get('Processed', False))), _now())
+        )
+
+    def upsert_detail(self, detail):
+        """Insert or update the scraped details of a listing and mark it processed."""
+        link = detail.get('Link')
+        if not link:
+            return
+
+        columns = [column for _, column in DETAIL_COLUMNS]
+        values = []
+        for csv_column, column in DETAIL_COLUMNS:
+            value = detail.get(csv_column)
+            if column == 'processed':
+                value = int(_is_true(value))
+            elif value is not None and value != value:
+                value = None  # NaN from pandas
+            values.append(value)
+
+        updates = ", ".join(f"{column} = excluded.{column}" for column in columns if column != 'link')
+        with self._lock:
+            self.conn.execute(
+                f"""
+                INSERT INTO details ({", ".join(columns)}, posting_id, date_scraped)
+                VALUES ({", ".join("?" for _ in columns)}, ?, ?)
+                ON CONFLICT(link) DO UPDATE SET {updates}, date_scraped = excluded.date_scraped
+                """,
+                values + [extract_posting_id(link), _now()]
+            )
+            self.conn.execute("UPDATE listings SET processed = 1 WHERE link = ?", (link,))
+            self.conn.execute("DELETE FROM dead_letters WHERE link = ?", (link,))
+            self.conn.commit()
+
+    def add_history(self, listing):
+        """Record a link in the history, keeping the date it was first seen."""
+        link = listing.get('Link')
+        if not link:
+            return False
+
+        cursor = self._execute(
+            "INSERT OR IGNORE INTO history (link, posting_id, city, title, date_scraped) VALUES (?, ?, ?, ?, ?)",
+            (link, extract_posting_id(link), listing.get('City'), listing.get('Title'),
+             listing.get('date_scraped') or _now())
+        )
+        return cursor.rowcount > 0
+
+    def add_dead_letter(self, listing, reason, attempts):
+        """Record a listing that failed every retry, with the reason of the last failure."""
+        link = listing.get('Link')
+        if not link:
+            return
+
+        self._execute(
+            """
+            INSERT INTO dead_letters (link, posting_id, city, title, reason, attempts, failed_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(link) DO UPDATE SET
+                reason = excluded.reason,
+                attempts = dead_letters.attempts + excluded.attempts,
+                failed_at = excluded.failed_at
+            """,
+            (link, extract_posting_id(link), listing.get('City'), listing.get('Title'),
+             reason, int(attempts), _now())
+        )
+
+    def dead_letter_count(self):
+        """Return the number of listings in the dead-letter table."""
+        return self._query("SELECT COUNT(*) AS count FROM dead_letters")[0]['count']
+
+    def save_schedule(self, schedule):
+        """Insert or update a recurring scrape schedule; its config is stored as JSON."""
+        self._execute(
+            """
+            INSERT INTO schedules (id, name, cron, config, priority, enabled, last_run, next_run, last_job_id, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                name = excluded.name,
+                cron = excluded.cron,
+                config = excluded.config,
+                priority = excluded.priority,
+                enabled = excluded.enabled,
+                last_run = excluded.last_run,
+                next_run = excluded.next_run,
+                last_job_id = excluded.last_job_id
+            """,
+            (schedule['id'], schedule.get('name'), schedule['cron'], json.dumps(schedule.get('config') or {}),
+             int(schedule.get('priority', 0)), int(bool(schedule.get('enabled', True))), schedule.get('last_run'),
+             schedule.get('next_run'), schedule.get('last_job_id'), schedule.get('created_at') or _now())
+        )
+
+    def get_schedules(self):
+        """Return every schedule, oldest first."""
+        schedules = self._query("SELECT * FROM schedules ORDER BY created_at")
+        for schedule in schedules:
+            schedule['config'] = json.loads(schedule['config'] or '{}')
+            schedule['enabled'] = bool(schedule['enabled'])
+        return schedules
+
+    def delete_schedule(self, schedule_id):
+        """Delete a schedule, returning False if it didn't exist."""
+        return self._execute("DELETE FROM schedules WHERE id = ?", (schedule_id,)).rowcount > 0
+
+    def get_watermark(self, city, scope=''):
+        """
+        Return the newest posting ID seen for a city, or None.
+
+        Watermarks are kept per scope, e.g. a hash of the keyword set, so a
+        run filtering for other keywords never stops at postings it never matched.
+        """
+        rows = self._query(
+            "SELECT posting_id FROM search_watermarks WHERE city = ? AND scope = ?", (city, scope or '')
+        )
+        return rows[0]['posting_id'] if rows else None
+
+    def set_watermark(self, city, posting_id, scope=''):
+        """Raise a city's watermark within a scope to the given posting ID."""
+        self._execute(
+            """
+            INSERT INTO search_watermarks (city, scope, posting_id, updated_at) VALUES (?, ?, ?, ?)
+            ON CONFLICT(city, scope) DO UPDATE SET
+                posting_id = MAX(search_watermarks.posting_id, excluded.posting_id),
+                updated_at = excluded.updated_at
+            """,
+            (city, scope or '', int(posting_id), _now())
+        )
+
+    def processed_keys(self):
+        """Return the posting IDs (or links, when there is no ID) of every listing with details."""
+        rows = self._query("SELECT COALESCE(posting_id, link) AS key FROM details")
+        return [row['key'] for row in rows]
+
+    def recent_titles(self, limit=100000):
+        """Return the link and title of the most recently scraped listings."""
+        return self._query(
+            "SELECT link, title FROM details WHERE title IS NOT NULL ORDER BY date_scraped DESC LIMIT ?",
+            (int(limit),)
+        )
+
+    def import_history_csv(self, filepath):
+        """Import a legacy history_links.csv file, returning the number of new links."""
+        if not os.path.exists(filepath):
+            return 0
+
+        added = 0
+        with open(filepath, 'r', encoding='utf-8', newline='') as f:
+            for row in csv.DictReader(f):
+                if self.add_history({
+                    'Link': (row.get('link') or '').strip(),
+                    'City': row.get('city'),
+                    'Title': row.get('title'),
+                    'date_scraped': row.get('date_scraped')
+                }):
+                    added += 1
+        return added
+
+    def history_count(self):
+        """Return the number of links in the history."""
+        return self._query("SELECT COUNT(*) AS count FROM history")[0]['count']
+
+    def export_csv(self, view, filepath):
+        """Write one of the *_csv views to a CSV file and return the number of rows."""
+        if view not in ('links_csv', 'results_csv', 'history_csv', 'dead_letters_csv'):
+            raise ValueError(f"Unknown export view: {view}")
+
+        directory = os.path.dirname(filepath)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._lock:
+            cursor = self.conn.execute(f"SELECT * FROM {view}")
+            headers = [description[0] for description in cursor.description]
+            count = 0
+            with open(filepath, 'w', encoding='utf-8', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(headers)
+                for row in cursor:
+                    writer.writerow(row)
+                    count += 1
+        return count
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            try:
+                self.conn.close()
+            except Exception as e:
+                print(f"Error closing listing store: {str(e)}")
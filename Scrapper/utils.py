@@ -1,9 +1,11 @@
 import os
+import re
 import time
 import random
 import pandas as pd
 from dotenv import load_dotenv
 import traceback
+from urllib.parse import urlencode
 
 # Load environment variables
 try:
@@ -97,6 +99,56 @@ def load_from_csv(filepath):
         print(f"Traceback: {traceback.format_exc()}")
         return pd.DataFrame()
 
+def extract_posting_id(link):
+    """Extract the numeric posting ID from a Craigslist listing link."""
+    if not link or not isinstance(link, str):
+        return None
+        
+    match = re.search(r'/(\d{6,})\.html', link)
+    return match.group(1) if match else None
+
+def build_search_url(base_url, city, offset=0, **params):
+    """Build a city's search URL, with the result offset and any extra query parameters."""
+    url = base_url.format(city)
+    
+    query = {key: value for key, value in params.items() if value is not None}
+    if offset:
+        query['s'] = offset
+    if not query:
+        return url
+        
+    separator = '&' if '?' in url else '?'
+    return url + separator + urlencode(query)
+
+def build_query_groups(keywords, max_length=1000):
+    """
+    Batch keywords into Craigslist OR-queries, e.g. 'php | wordpress | "mobile app"'.
+    
+    Each query stays under max_length characters once URL-encoded.
+    """
+    groups = []
+    current = []
+    
+    for keyword in keywords:
+        keyword = " ".join(str(keyword).split())
+        if not keyword:
+            continue
+            
+        # Quote phrases and terms with punctuation so they are matched as written
+        term = keyword if keyword.isalnum() else f'"{keyword}"'
+        candidate = " | ".join(current + [term])
+        
+        if current and len(urlencode({'query': candidate})) > max_length:
+            groups.append(" | ".join(current))
+            current = [term]
+        else:
+            current.append(term)
+    
+    if current:
+        groups.append(" | ".join(current))
+    
+    return groups
+
 def remove_duplicates(df, column_name):
     """Remove duplicate rows based on a specific column."""
     try:
@@ -0,0 +1,99 @@
+import copy
+import threading
+from queue import Queue, Empty
+from concurrent.futures import ThreadPoolExecutor
+
+class WorkerPool:
+    """
+    Pool of scraper workers that each own an independent WebDriver.
+
+    Workers are shallow copies of the parent scraper, so they share its
+    configuration and HTTP session but drive their own browser. The parent
+    scraper itself is the first worker.
+    """
+
+    def __init__(self, scraper, size=1):
+        self.scraper = scraper
+        self.size = max(1, int(size))
+        self._idle = Queue()
+        self._workers = [scraper]
+        self._lock = threading.Lock()
+        self._idle.put(scraper)
+
+    def _create_worker(self):
+        """Create a new worker that shares the scraper's settings but not its browser."""
+        worker = copy.copy(self.scraper)
+        worker.driver = None
+        worker._captcha_detected = False
+        worker._blocked = False
+        worker.identity = f"worker-{len(self._workers)}"
+        return worker
+
+    def _acquire(self):
+        """Take an idle worker, creating one if the pool isn't full yet."""
+        try:
+            return self._idle.get_nowait()
+        except Empty:
+            pass
+
+        with self._lock:
+            if len(self._workers) < self.size:
+                worker = self._create_worker()
+                self._workers.append(worker)
+                return worker
+
+        return self._idle.get()
+
+    def _run(self, func, item):
+        """Run func on an item with a worker borrowed from the pool."""
+        worker = self._acquire()
+        try:
+            return func(worker, item)
+        finally:
+            self._idle.put(worker)
+
+    def map(self, func, items):
+        """
+        Call func(worker, item) for every item, spreading items over the workers.
+
+        Results are returned in the order of the items.
+        """
+        items = list(items)
+        if not items:
+            return []
+
+        # A single worker runs inline so the original sequential behaviour is kept
+        if self.size == 1:
+            return [func(self.scraper, item) for item in items]
+
+        with ThreadPoolExecutor(max_workers=min(self.size, len(items))) as executor:
+            futures = [executor.submit(self._run, func, item) for item in items]
+            return [future.result() for future in futures]
+
+    def driver_pids(self):
+        """Return the ChromeDriver process IDs of every worker's browser."""
+        with self._lock:
+            workers = list(self._workers)
+
+        pids = set()
+        for worker in workers:
+            try:
+                if worker.driver:
+                    pids.add(worker.driver.service.process.pid)
+            except Exception:
+                pass
+        return pids
+
+    def close(self):
+        """Quit the browsers of every worker except the parent scraper."""
+        with self._lock:
+            workers = [worker for worker in self._workers if worker is not self.scraper]
+            self._workers = [self.scraper]
+
+        for worker in workers:
+            if worker.driver:
+                try:
+                    worker.driver.quit()
+                except Exception as e:
+                    print(f"Error closing worker browser: {str(e)}")
+                worker.driver = None